@@ -0,0 +1,360 @@
+"""
+Caché LRU en memoria para simulaciones de Lotka-Volterra.
+Las entradas se indexan por parámetros cuantizados, de modo que valores
+que solo difieren por ruido de coma flotante (sliders, JSON) comparten
+resultado. Los arreglos devueltos son de solo lectura.
+
+Detrás de la caché en memoria está el almacén persistente en disco
+(backend.trajectory_store): un fallo en memoria se busca primero allí.
+
+Con method="canonical" lo que se guarda es la trayectoria adimensional
+(ρ, u0, v0): problemas que solo difieren en β, δ o la escala de tiempo
+comparten entrada y se sirven reescalando.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from backend.glv import glv_params, simulate_glv
+from backend.simulation import (
+    CANONICAL_DTAU,
+    DEFAULT_PARAMS,
+    detect_period,
+    from_canonical,
+    rk4_trajectory,
+    simulate_lotka_volterra,
+    simulate_lotka_volterra_batch,
+    simulate_lotka_volterra_canonical,
+    to_canonical,
+)
+from backend.trajectory_store import trajectory_store
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+CACHE_MAXSIZE = 256
+QUANTIZE_DIGITS = 10    # Cifras significativas conservadas en la clave
+
+# ============================================================
+# CACHÉ LRU GENÉRICA
+# ============================================================
+
+def quantize(x, digits=QUANTIZE_DIGITS):
+    """Redondea a `digits` cifras significativas (clave estable para floats)."""
+    return float(f"{float(x):.{digits}g}")
+
+
+def freeze(sol):
+    """Marca como solo lectura todos los arreglos NumPy de un dict de resultados."""
+    for value in sol.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return sol
+
+
+class LRUCache:
+    """
+    Caché acotada con política LRU y contadores de aciertos/fallos/desalojos.
+    Segura entre hilos (los callbacks de Dash pueden ejecutarse en paralelo).
+    """
+
+    def __init__(self, maxsize=CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+# ============================================================
+# SIMULACIONES CACHEADAS
+# ============================================================
+
+simulation_cache = LRUCache()
+
+
+# Métodos de paso fijo cuya entrada no depende del horizonte: la trayectoria
+# hasta t_max es un prefijo de la de cualquier horizonte mayor
+EXTENDABLE_METHODS = ("rk4",)
+
+
+def simulation_key(alpha, beta, delta, gamma, P0, D0, t_max, dt, method="rk4",
+                   model="lv", K=np.inf, Th=0.0):
+    """
+    Clave cuantizada: (método, α, β, δ, γ, P0, D0, t_max, dt).
+    En los métodos extensibles t_max se guarda como None: hay una sola
+    entrada por problema y el horizonte se ajusta al leerla.
+    Con una variante del modelo el primer campo es (método, modelo, K, Th);
+    con "lv" es solo el método, así las claves clásicas no cambian.
+    """
+    spec = method if model == "lv" else (method, model, quantize(K), quantize(Th))
+    key = (spec,) + tuple(quantize(x) for x in (alpha, beta, delta, gamma, P0, D0, t_max, dt))
+    if method in EXTENDABLE_METHODS:
+        key = key[:7] + (None,) + key[8:]
+    return key
+
+
+def key_model(key):
+    """(método, modelo, K, Th) de una clave de `simulation_key`."""
+    spec = key[0]
+    return (spec, "lv", np.inf, 0.0) if isinstance(spec, str) else spec
+
+
+def simulate_lotka_volterra_cached(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    method="rk4",
+    model="lv",
+    K=np.inf,
+    Th=0.0,
+    r=None,
+    A=None,
+    x0=None,
+):
+    """
+    `simulate_lotka_volterra` con caché LRU.
+
+    La simulación se ejecuta con los valores ya cuantizados, así el resultado
+    no depende de cuál de las entradas equivalentes llegó primero.
+    Orden de búsqueda: memoria → disco → simular (y guardar en ambos).
+    Devuelve un dict nuevo con arreglos de solo lectura.
+
+    Con method="rk4" la entrada se extiende o recorta según t_max
+    (`extend_trajectory`). Con method="canonical" se cachea la trayectoria
+    adimensional (`canonical_trajectory`) y cada pedido se reescala a partir
+    de ella; si α o γ son 0, o el modelo no es "lv", no hay forma canónica
+    y se usa RK4 con "period" None. model="glv" va a `glv_cached`.
+    """
+    if model == "glv":
+        return glv_cached(alpha, beta, delta, gamma, P0, D0, t_max, dt, method, r, A, x0)
+
+    t_max = quantize(t_max)
+    if method == "canonical":
+        if model == "lv" and quantize(alpha) * quantize(gamma) > 0:
+            q = simulation_key(alpha, beta, delta, gamma, P0, D0, t_max, dt, method)[1:]
+            return freeze(from_canonical(canonical_trajectory(*q[:7]), *q[:4], q[6], q[7]))
+        key = simulation_key(alpha, beta, delta, gamma, P0, D0, t_max, dt, "rk4", model, K, Th)
+        sol = extend_trajectory(key, t_max)
+        sol["period"] = None
+        return sol
+
+    key = simulation_key(alpha, beta, delta, gamma, P0, D0, t_max, dt, method, model, K, Th)
+    if method in EXTENDABLE_METHODS:
+        return extend_trajectory(key, t_max)
+
+    sol = simulation_cache.get(key)
+    if sol is None:
+        sol = trajectory_store.get(key)
+        if sol is None:
+            _, model, K, Th = key_model(key)
+            sol = simulate_lotka_volterra(*key[1:], method=method, model=model, K=K, Th=Th)
+            trajectory_store.put(key, sol)
+        sol = freeze(sol)
+        simulation_cache.put(key, sol)
+    return dict(sol)
+
+
+def extend_trajectory(key, t_max):
+    """
+    Trayectoria RK4 de una clave sin horizonte, hasta t_max.
+
+    Si la entrada guardada ya cubre t_max se devuelven vistas de sus
+    arreglos; si es más corta se continúa desde su estado final y solo se
+    integra el tramo nuevo. RK4 es determinista, así que el resultado es
+    idéntico bit a bit a simular desde t = 0.
+    """
+    a, b, d, g, P0, D0, _, dt = key[1:]
+    _, model, K, Th = key_model(key)
+    n = int(t_max / dt) + 1
+
+    sol = simulation_cache.get(key)
+    if sol is None or sol["P"].size < n:
+        stored = trajectory_store.get(key)
+        if stored is not None and (sol is None or stored["P"].size > sol["P"].size):
+            sol = stored
+        if sol is None or sol["P"].size < n:
+            if sol is None:
+                P, D = rk4_trajectory(P0, D0, dt, n - 1, a, b, d, g, "auto", model, K, Th)
+            else:
+                start = sol["P"].size - 1
+                Pn, Dn = rk4_trajectory(sol["P"][start], sol["D"][start], dt, n - 1 - start,
+                                        a, b, d, g, "auto", model, K, Th)
+                P = np.concatenate([sol["P"], Pn[1:]])
+                D = np.concatenate([sol["D"], Dn[1:]])
+            sol = {"t": np.arange(n) * dt, "P": P, "D": D}
+            trajectory_store.put(key, sol)
+        sol = freeze(sol)
+        simulation_cache.put(key, sol)
+
+    # La malla se reconstruye igual que en simulate_lotka_volterra
+    return {"t": np.linspace(0, t_max, n), "P": sol["P"][:n], "D": sol["D"][:n]}
+
+
+def canonical_trajectory(alpha, beta, delta, gamma, P0, D0, t_max):
+    """
+    Trayectoria canónica (ρ, u0, v0) que cubre τ = α·t_max, desde la caché.
+
+    La clave no incluye el horizonte: se guarda una sola entrada por
+    (ρ, u0, v0) que llega justo hasta el τ pedido. Si un pedido posterior
+    la excede, se integra solo el tramo nuevo desde el estado final
+    guardado (RK4 de paso fijo: idéntico a integrar de una vez).
+    """
+    rho, u0, v0 = (quantize(x) for x in to_canonical(alpha, beta, delta, gamma, P0, D0))
+    key = ("canonical", rho, u0, v0)
+    tau_needed = float(alpha) * t_max + 2*CANONICAL_DTAU
+
+    canon = simulation_cache.get(key)
+    if canon is None or canon["t"][-1] < tau_needed:
+        stored = trajectory_store.get(key)
+        if stored is not None and (canon is None or stored["t"][-1] > canon["t"][-1]):
+            canon = stored
+        if canon is None or canon["t"][-1] < tau_needed:
+            if canon is None:
+                canon = simulate_lotka_volterra_canonical(rho, u0, v0, tau_needed)
+            else:
+                canon = _extend_canonical(canon, rho, tau_needed)
+            trajectory_store.put(key, canon)
+        canon = freeze(canon)
+        simulation_cache.put(key, canon)
+    return canon
+
+
+def _extend_canonical(canon, rho, tau_max):
+    more = simulate_lotka_volterra_canonical(
+        rho, float(canon["P"][-1]), float(canon["D"][-1]), tau_max - float(canon["t"][-1]),
+    )
+    P = np.concatenate([canon["P"], more["P"][1:]])
+    D = np.concatenate([canon["D"], more["D"][1:]])
+    period = canon["period"]
+    if period is None:
+        period = detect_period(P, D, CANONICAL_DTAU, 1.0, 1.0, rho, rho)
+    return {"t": np.arange(P.size) * CANONICAL_DTAU, "P": P, "D": D, "period": period}
+
+
+def glv_cached(alpha, beta, delta, gamma, P0, D0, t_max, dt, method="rk4", r=None, A=None, x0=None):
+    """
+    model="glv" con la caché en memoria (ver `simulate_lotka_volterra`).
+    La clave lleva r, A y x0 cuantizados y sus formas. No pasa por el
+    almacén en disco, que guarda filas t, P, D y no el estado "X" de n especies.
+    """
+    arrays = [
+        np.array([quantize(v) for v in np.ravel(x)]).reshape(np.shape(x))
+        for x in glv_params(alpha, beta, delta, gamma, P0, D0, r, A, x0)
+    ]
+    key = (("glv", method) + tuple(x.shape for x in arrays), quantize(t_max), quantize(dt))
+    key += tuple(v for x in arrays for v in x.ravel().tolist())
+
+    sol = simulation_cache.get(key)
+    if sol is None:
+        sol = freeze(simulate_glv(*arrays, key[1], key[2], method=method))
+        simulation_cache.put(key, sol)
+    return dict(sol)
+
+
+def simulate_lotka_volterra_batch_cached(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    model="lv",
+    K=np.inf,
+    Th=0.0,
+):
+    """
+    `simulate_lotka_volterra_batch` con caché por trayectoria.
+
+    Solo las filas ausentes de la caché (o guardadas con un horizonte menor)
+    se simulan, en un único lote. Cada fila se guarda como una entrada RK4
+    normal: el paso vectorizado es idéntico bit a bit al escalar, así que
+    ambas rutas comparten entradas.
+    """
+    rows = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float))
+          for x in (alpha, beta, delta, gamma, P0, D0, K, Th))
+    )
+    t_max = quantize(t_max)
+    keys = [
+        simulation_key(*params[:6], t_max, dt, "rk4", model, *params[6:])
+        for params in zip(*(r.tolist() for r in rows))
+    ]
+    dt = keys[0][8]
+    n = int(t_max / dt) + 1
+
+    sols = [simulation_cache.get(k) for k in keys]
+    for i, k in enumerate(keys):
+        if sols[i] is None:
+            sols[i] = trajectory_store.get(k)
+            if sols[i] is not None:
+                simulation_cache.put(k, sols[i])
+
+    missing = [i for i, sol in enumerate(sols) if sol is None or sol["P"].size < n]
+    if missing:
+        q = np.array([keys[i][1:7] + key_model(keys[i])[2:] for i in missing]).T
+        batch = simulate_lotka_volterra_batch(*q[:6], t_max, dt, model, *q[6:])
+        t = np.arange(n) * dt
+        for j, i in enumerate(missing):
+            sol = freeze({"t": t, "P": batch["P"][j].copy(), "D": batch["D"][j].copy()})
+            trajectory_store.put(keys[i], sol)
+            simulation_cache.put(keys[i], sol)
+            sols[i] = sol
+
+    return {
+        "t": np.linspace(0, t_max, n),
+        "P": np.stack([sol["P"][:n] for sol in sols]),
+        "D": np.stack([sol["D"][:n] for sol in sols]),
+    }
+
+
+def cache_stats():
+    """Contadores de la caché en memoria y del almacén en disco."""
+    stats = simulation_cache.stats()
+    stats["disk"] = trajectory_store.stats()
+    return stats
@@ -0,0 +1,119 @@
+"""
+Comparación de métodos numéricos de paso fijo.
+Cada método de paso fijo del registro (`INTEGRATORS`) avanza con
+`simulation.fixed_step_trajectory`, la misma ruta que usa
+`simulate_lotka_volterra`, y el error se mide contra una referencia RK4
+con subpasos, cacheada, que solo se calcula si se piden los errores.
+"""
+
+import numpy as np
+
+from backend.cache import LRUCache, freeze, quantize
+from backend.integrators import INTEGRATORS, fixed_step_nfev
+from backend.simulation import FIXED_STEP_METHODS, fixed_step_trajectory, rk4_trajectory
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+COMPARISON_METHODS = FIXED_STEP_METHODS
+
+# La referencia da REFERENCE_SUBSTEPS o más pasos RK4 por paso h de la malla
+# (y nunca pasos mayores que REFERENCE_MAX_STEP): su error es al menos
+# m⁴ = 4096 veces menor que el de RK4 con paso h
+REFERENCE_SUBSTEPS = 8
+REFERENCE_MAX_STEP = 0.01
+REFERENCE_CHUNK = 1 << 16       # Subpasos por tramo (acota la memoria)
+
+reference_cache = LRUCache(maxsize=32)
+
+# ============================================================
+# REFERENCIA DE ALTA PRECISIÓN
+# ============================================================
+
+def reference_substeps(h):
+    """Subpasos RK4 de la referencia por cada paso h de la malla."""
+    return max(REFERENCE_SUBSTEPS, int(np.ceil(h / REFERENCE_MAX_STEP)))
+
+
+def reference_solution(P0, D0, h, n_steps, a, b, d, g):
+    """
+    RK4 con `reference_substeps(h)` subpasos por paso, muestreado en la
+    malla k·h (cacheado). Al ser de paso fijo no puede fallar por
+    tolerancia ni por número de pasos y su coste es predecible.
+
+    Returns:
+        dict: {"t", "P", "D"} de longitud n_steps + 1 (solo lectura)
+    """
+    key = (quantize(P0), quantize(D0), quantize(h), int(n_steps)) + tuple(quantize(x) for x in (a, b, d, g))
+    ref = reference_cache.get(key)
+    if ref is None:
+        P0, D0, h, n_steps, a, b, d, g = key
+        m = reference_substeps(h)
+        per_chunk = max(1, REFERENCE_CHUNK // m)
+
+        P = np.empty(n_steps + 1)
+        D = np.empty(n_steps + 1)
+        P[0], D[0] = P0, D0
+        k = 0
+        while k < n_steps:
+            # Continuar RK4 desde el último estado da lo mismo que integrar de una vez
+            c = min(per_chunk, n_steps - k)
+            Pf, Df = rk4_trajectory(P[k], D[k], h / m, c * m, a, b, d, g)
+            P[k + 1:k + c + 1] = Pf[m::m]
+            D[k + 1:k + c + 1] = Df[m::m]
+            k += c
+
+        ref = freeze({"t": h * np.arange(n_steps + 1), "P": P, "D": D})
+        reference_cache.put(key, ref)
+    return ref
+
+# ============================================================
+# MOTOR DE COMPARACIÓN
+# ============================================================
+
+def compare_methods(methods, P0, D0, h, n_steps, a, b, d, g, errors=True):
+    """
+    Avanza los métodos elegidos sobre t = k·h, k = 0..n_steps, recortando
+    a 0 tras cada paso como `integrate(..., nonnegative=True)`. Con
+    errors=False no se calcula la referencia ni las columnas de error.
+
+    Un método inestable para este h diverge a inf/NaN: "diverged_at" da el
+    primer paso no finito de cada método (−1 si se mantiene finito).
+
+    Returns:
+        dict: {"t": (n + 1,), "methods", "labels", "P", "D": (M, n + 1),
+               "nfev": (M,), "diverged_at": (M,)} y, con errors, "ref_P",
+               "ref_D": (n + 1,) y "err_P", "err_D": (M, n + 1) con
+               err = |método − referencia|.
+    """
+    methods = tuple(methods)
+    unknown = [m for m in methods if m not in COMPARISON_METHODS]
+    if not methods or unknown:
+        raise ValueError(f"Métodos no válidos: {unknown or methods!r} (opciones: {COMPARISON_METHODS})")
+
+    P = np.empty((len(methods), n_steps + 1))
+    D = np.empty((len(methods), n_steps + 1))
+    for j, method in enumerate(methods):
+        P[j], D[j] = fixed_step_trajectory(method, P0, D0, h, n_steps, a, b, d, g)
+
+    finite = np.isfinite(P) & np.isfinite(D)
+
+    out = {
+        "t": h * np.arange(n_steps + 1),
+        "methods": methods,
+        "labels": tuple(INTEGRATORS[m]["label"] for m in methods),
+        "P": P,
+        "D": D,
+        "nfev": np.array([fixed_step_nfev(m, n_steps) for m in methods]),
+        "diverged_at": np.where(finite.all(axis=1), -1, np.argmin(finite, axis=1)),
+    }
+    if errors:
+        ref = reference_solution(P0, D0, h, n_steps, a, b, d, g)
+        out.update({
+            "ref_P": ref["P"],
+            "ref_D": ref["D"],
+            "err_P": np.abs(P - ref["P"]),
+            "err_D": np.abs(D - ref["D"]),
+        })
+    return out
@@ -0,0 +1,35 @@
+"""
+Configuración compartida del backend (rutas y límites).
+Los valores pueden sobrescribirse con variables de entorno.
+"""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Carpeta backend/
+
+# ============================================================
+# ALMACÉN PERSISTENTE DE TRAYECTORIAS
+# ============================================================
+
+# Directorio compartido entre workers de Dash y el backend de render
+TRAJECTORY_STORE_DIR = os.environ.get(
+    "LV_TRAJECTORY_STORE_DIR", os.path.join(BASE_DIR, "trajectories")
+)
+
+# Tamaño máximo en disco antes de desalojar las entradas menos usadas
+TRAJECTORY_STORE_MAX_MB = float(os.environ.get("LV_TRAJECTORY_STORE_MAX_MB", "256"))
+
+# "0" desactiva el almacén (útil en despliegues de solo lectura)
+TRAJECTORY_STORE_ENABLED = os.environ.get("LV_TRAJECTORY_STORE_ENABLED", "1") != "0"
+
+# ============================================================
+# INSTANTÁNEAS DEL MODELO ESPACIAL
+# ============================================================
+
+# Cada simulación espacial escribe sus fotogramas aquí mientras avanza
+SPATIAL_STORE_DIR = os.environ.get(
+    "LV_SPATIAL_STORE_DIR", os.path.join(BASE_DIR, "spatial_frames")
+)
+
+# Una rejilla 512×512 ocupa ~2 MB por fotograma (float32, dos especies)
+SPATIAL_STORE_MAX_MB = float(os.environ.get("LV_SPATIAL_STORE_MAX_MB", "1024"))
@@ -0,0 +1,59 @@
+"""
+Reducción de puntos para gráficos (Largest-Triangle-Three-Buckets).
+Conserva la forma visual de la curva (picos y valles) enviando al
+navegador del orden de un punto por píxel en lugar de cada muestra RK4.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Índices de las muestras que elige LTTB.
+
+    Se conservan siempre el primer y el último punto; el resto se divide en
+    n_out - 2 cubetas consecutivas y de cada una se elige el punto que forma
+    el triángulo de mayor área con el punto elegido en la cubeta anterior y
+    el promedio de la siguiente. Sirve también para curvas paramétricas
+    (p. ej. plano de fases), ya que las cubetas son por índice.
+
+    Args:
+        x, y (array_like): Coordenadas de la curva, misma longitud n.
+        n_out (int): Número de puntos deseado.
+
+    Returns:
+        ndarray: Índices crecientes (n_out, o n si la curva ya es más corta).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bordes de las cubetas interiores sobre los índices 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Promedios de cada cubeta (la "siguiente" de la última es el punto final)
+    counts = ends - starts
+    avg_x = np.append(np.add.reduceat(x[:-1], starts) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], starts) / counts, y[-1])
+
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = starts[i], ends[i]
+        bx, by = x[lo:hi], y[lo:hi]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return idx
+
+
+def lttb(x, y, n_out):
+    """Devuelve (x, y) reducidos a n_out puntos con LTTB."""
+    idx = lttb_indices(x, y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
@@ -0,0 +1,203 @@
+"""
+Eventos sobre trayectorias de Lotka-Volterra.
+Un evento es una función g(t, P, D, α, β, δ, γ) (vectorizada) cuyo cruce
+por cero marca el instante buscado, al estilo de scipy.solve_ivp: los
+atributos `terminal` (detener la simulación) y `direction` (+1 solo
+cruces ascendentes, −1 solo descendentes, 0 ambos) controlan su efecto.
+El instante exacto se refina por bisección sobre el interpolante de
+Hermite de cada paso, no sobre la malla de muestreo.
+"""
+
+import numpy as np
+
+from backend.simulation import (
+    DEFAULT_PARAMS,
+    STREAM_CHUNK_SIZE,
+    hermite_interp,
+    iter_lotka_volterra,
+)
+
+EVENT_BISECT_ITER = 50
+SPECIES = ("P", "D")
+
+# ============================================================
+# FÁBRICAS DE EVENTOS
+# ============================================================
+
+def make_event(fn, terminal=False, direction=0, name=None):
+    """Añade los atributos de evento a una función g(t, P, D, α, β, δ, γ)."""
+    fn.terminal = terminal
+    fn.direction = direction
+    fn.name = name or getattr(fn, "__name__", "evento")
+    return fn
+
+
+def _check_species(species):
+    if species not in SPECIES:
+        raise ValueError(f"Especie desconocida: {species!r} (opciones: {SPECIES})")
+
+
+def extinction_event(threshold=1.0, species="P", terminal=True):
+    """La población `species` cae por debajo de `threshold` (termina por defecto)."""
+    _check_species(species)
+    i = SPECIES.index(species)
+    return make_event(
+        lambda t, P, D, a, b, d, g: (P, D)[i] - threshold,
+        terminal=terminal, direction=-1, name=f"extinción {species}",
+    )
+
+
+def peak_event(species="P", kind="max", terminal=False):
+    """
+    Máximos (kind="max") o mínimos (kind="min") locales de `species`.
+
+    Se usa la tasa per cápita (α − βD para P, δP − γ para D): tiene los
+    mismos ceros que la derivada y no se anula con la población.
+    """
+    _check_species(species)
+    if kind not in ("max", "min"):
+        raise ValueError(f"Tipo de extremo desconocido: {kind!r} (opciones: 'max', 'min')")
+
+    if species == "P":
+        rate = lambda t, P, D, a, b, d, g: a - b * D
+    else:
+        rate = lambda t, P, D, a, b, d, g: d * P - g
+    return make_event(
+        rate, terminal=terminal, direction=-1 if kind == "max" else 1,
+        name=f"{kind} {species}",
+    )
+
+
+def crossing_event(level, species="P", direction=0, terminal=False):
+    """La población `species` cruza el nivel `level`."""
+    _check_species(species)
+    i = SPECIES.index(species)
+    return make_event(
+        lambda t, P, D, a, b, d, g: (P, D)[i] - level,
+        terminal=terminal, direction=direction, name=f"{species} = {level:g}",
+    )
+
+# ============================================================
+# LOCALIZACIÓN SOBRE UNA TRAYECTORIA MUESTREADA
+# ============================================================
+
+def locate_events(t, P, D, a, b, d, g, events):
+    """
+    Localiza los cruces de cada evento en una trayectoria de paso uniforme.
+
+    Los cambios de signo se buscan de forma vectorizada sobre las muestras
+    y cada uno se refina por bisección (todas a la vez) sobre el
+    interpolante de Hermite del paso.
+
+    Returns:
+        list: por evento, un dict {"t": (m,), "P": (m,), "D": (m,)}.
+    """
+    t, P, D = (np.asarray(x, dtype=float) for x in (t, P, D))
+    out = []
+    if t.size < 2:
+        return [{"t": np.empty(0), "P": np.empty(0), "D": np.empty(0)} for _ in events]
+
+    h = t[1] - t[0]
+    for event in events:
+        v = np.broadcast_to(event(t, P, D, a, b, d, g), t.shape)
+        v0, v1 = v[:-1], v[1:]
+        up = (v0 < 0) & (v1 >= 0)
+        down = (v0 > 0) & (v1 <= 0)
+        direction = getattr(event, "direction", 0)
+        mask = up if direction > 0 else down if direction < 0 else up | down
+        k = np.nonzero(mask)[0]
+
+        P0, D0, P1, D1 = P[k], D[k], P[k+1], D[k+1]
+        lo, hi = np.zeros(k.size), np.ones(k.size)
+        f_lo = v0[k]
+        for _ in range(EVENT_BISECT_ITER):
+            mid = 0.5 * (lo + hi)
+            Pm, Dm = hermite_interp(P0, D0, P1, D1, h, mid, a, b, d, g)
+            f_mid = event(t[k] + mid * h, Pm, Dm, a, b, d, g)
+            same = (f_mid > 0) == (f_lo > 0)
+            lo, f_lo = np.where(same, mid, lo), np.where(same, f_mid, f_lo)
+            hi = np.where(same, hi, mid)
+
+        s = 0.5 * (lo + hi)
+        Pe, De = hermite_interp(P0, D0, P1, D1, h, s, a, b, d, g)
+        out.append({"t": t[k] + s * h, "P": Pe, "D": De})
+    return out
+
+# ============================================================
+# SIMULACIÓN CON EVENTOS Y PARADA ANTICIPADA
+# ============================================================
+
+def simulate_lotka_volterra_events(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    events=(),
+    chunk_size=STREAM_CHUNK_SIZE,
+    backend="auto",
+):
+    """
+    RK4 por tramos (`iter_lotka_volterra`) buscando eventos en cada tramo.
+
+    Si un evento terminal ocurre, la integración se detiene: la trayectoria
+    termina en la primera muestra posterior al evento y solo se conservan
+    los eventos anteriores a él. Sin eventos terminales el resultado
+    coincide con `simulate_lotka_volterra`.
+
+    Returns:
+        dict: {"t", "P", "D", "events": lista (una entrada por evento) de
+        {"t", "P", "D"}, "terminated_by": nombre del evento terminal o None}
+    """
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    ts, Ps, Ds = [], [], []
+    found = [[] for _ in events]
+    terminated_by = None
+    prev = None
+
+    for t, P, D in iter_lotka_volterra(a, b, d, g, P0, D0, t_max, dt, chunk_size, backend):
+        # Se antepone la última muestra del tramo anterior para no perder cruces en la frontera
+        if prev is not None:
+            tc, Pc, Dc = (np.concatenate([[x], y]) for x, y in zip(prev, (t, P, D)))
+        else:
+            tc, Pc, Dc = t, P, D
+        prev = (t[-1], P[-1], D[-1])
+
+        hits = locate_events(tc, Pc, Dc, a, b, d, g, events)
+        t_stop = min(
+            (hit["t"][0] for event, hit in zip(events, hits)
+             if getattr(event, "terminal", False) and hit["t"].size),
+            default=None,
+        )
+        for i, hit in enumerate(hits):
+            keep = hit["t"] <= t_stop if t_stop is not None else slice(None)
+            found[i].append({key: val[keep] for key, val in hit.items()})
+
+        if t_stop is not None:
+            terminated_by = next(
+                event.name for event, hit in zip(events, hits)
+                if getattr(event, "terminal", False) and hit["t"].size and hit["t"][0] == t_stop
+            )
+            k = int(np.searchsorted(t, t_stop, side="left")) + 1
+            t, P, D = t[:k], P[:k], D[:k]
+
+        ts.append(t)
+        Ps.append(P)
+        Ds.append(D)
+        if t_stop is not None:
+            break
+
+    return {
+        "t": np.concatenate(ts),
+        "P": np.concatenate(Ps),
+        "D": np.concatenate(Ds),
+        "events": [
+            {key: np.concatenate([c[key] for c in chunks]) if chunks else np.empty(0)
+             for key in ("t", "P", "D")}
+            for chunks in found
+        ],
+        "terminated_by": terminated_by,
+    }
@@ -0,0 +1,135 @@
+"""
+Lotka-Volterra generalizado para n especies (forma matricial).
+    dx/dt = x ⊙ (r + A x)
+con r (n,) tasas intrínsecas y A (n, n) matriz de interacción. Admite
+lotes: r (..., n), A (..., n, n) y x0 (..., n) se difunden entre sí, y
+todas las trayectorias avanzan en el mismo bucle vectorizado.
+
+También se usa a través de `simulate_lotka_volterra(model="glv", r=...,
+A=..., x0=...)` y su versión cacheada. El Simulador no lo expone: su
+formulario describe dos especies con α, β, δ, γ, y con n = 2 el sistema
+generalizado es el clásico; el resultado incluye "P" y "D" en ese caso,
+así que sirve directamente a los gráficos.
+"""
+
+import numpy as np
+
+from backend.integrators import dopri5
+from backend.simulation import DEFAULT_PARAMS
+
+GLV_METHODS = ("rk4", "rk45")
+
+# ============================================================
+# CAMPO VECTORIAL
+# ============================================================
+
+def glv_rhs(x, r, A):
+    """x ⊙ (r + A x) sobre el último eje (admite lotes)."""
+    return x * (r + np.matmul(A, x[..., None])[..., 0])
+
+
+def glv_field(r, A):
+    """Campo f(t, x) para integradores genéricos."""
+    def f(t, x):
+        return glv_rhs(x, r, A)
+    return f
+
+
+def lotka_volterra_to_glv(alpha, beta, delta, gamma):
+    """
+    (r, A) del sistema clásico de dos especies: x = [P, D],
+        r = [α, −γ],   A = [[0, −β], [δ, 0]].
+    Escalares o arreglos (N,) dan r (..., 2) y A (..., 2, 2).
+    """
+    a, b, d, g = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (alpha, beta, delta, gamma)))
+    zero = np.zeros_like(a)
+    r = np.stack([a, -g], axis=-1)
+    A = np.stack([np.stack([zero, -b], axis=-1), np.stack([d, zero], axis=-1)], axis=-2)
+    return r, A
+
+
+def glv_params(alpha, beta, delta, gamma, P0, D0, r=None, A=None, x0=None):
+    """
+    (r, A, x0) de model="glv": los que se pasen y, para los que falten,
+    los del sistema clásico de dos especies con x0 = [P0, D0].
+    """
+    r_lv, A_lv = lotka_volterra_to_glv(alpha, beta, delta, gamma)
+    return (
+        r_lv if r is None else np.asarray(r, dtype=float),
+        A_lv if A is None else np.asarray(A, dtype=float),
+        np.array([P0, D0], dtype=float) if x0 is None else np.asarray(x0, dtype=float),
+    )
+
+# ============================================================
+# INTEGRADORES
+# ============================================================
+
+def rk4_step_glv(x, h, r, A):
+    """Un paso RK4 vectorizado (recorta a 0 como `rk4_step`)."""
+    k1 = glv_rhs(x, r, A)
+    k2 = glv_rhs(x + 0.5*h*k1, r, A)
+    k3 = glv_rhs(x + 0.5*h*k2, r, A)
+    k4 = glv_rhs(x + h*k3, r, A)
+    return np.maximum(x + (h/6)*(k1 + 2*k2 + 2*k3 + k4), 0.0)
+
+
+def simulate_glv(
+    r,
+    A,
+    x0,
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    method="rk4",
+    rtol=1e-8,
+    atol=1e-9,
+):
+    """
+    Simula el sistema LV generalizado.
+
+    method: "rk4" (paso fijo dt) o "rk45" (Dormand-Prince adaptativo con
+    salida densa en la malla de paso dt; un único control de paso para
+    todo el lote).
+
+    Returns:
+        dict: {"t": (n_steps,), "X": (..., n, n_steps)} con el tiempo en el
+        último eje, como `simulate_lotka_volterra_batch`. Con n = 2 incluye
+        además "P" y "D" (= X[..., 0, :] y X[..., 1, :]), de modo que el
+        resultado sirve directamente a los gráficos del Simulador.
+    """
+    r = np.asarray(r, dtype=float)
+    A = np.asarray(A, dtype=float)
+    x0 = np.asarray(x0, dtype=float)
+    n_species = r.shape[-1]
+    if A.shape[-2:] != (n_species, n_species) or x0.shape[-1] != n_species:
+        raise ValueError(
+            f"Dimensiones incompatibles: r {r.shape}, A {A.shape}, x0 {x0.shape} "
+            f"(se esperaba r (..., n), A (..., n, n), x0 (..., n))."
+        )
+
+    batch = np.broadcast_shapes(r.shape[:-1], A.shape[:-2], x0.shape[:-1])
+    r = np.broadcast_to(r, batch + (n_species,))
+    A = np.broadcast_to(A, batch + (n_species, n_species))
+    x = np.broadcast_to(x0, batch + (n_species,)).copy()
+
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+
+    if method == "rk45":
+        sol = dopri5(glv_field(r, A), x, (0.0, t_max), t_eval=t, rtol=rtol, atol=atol)
+        X = np.maximum(sol["y"], 0.0)
+    elif method == "rk4":
+        X = np.empty((n,) + x.shape)
+        X[0] = x
+        for k in range(1, n):
+            x = rk4_step_glv(x, dt, r, A)
+            X[k] = x
+    else:
+        raise ValueError(f"Método desconocido: {method!r} (opciones: {GLV_METHODS})")
+
+    # Filas = pasos durante la integración; tiempo en el último eje al devolver
+    out = {"t": t, "X": np.ascontiguousarray(np.moveaxis(X, 0, -1))}
+    if method == "rk45":
+        out["n_steps"], out["nfev"] = sol["n_steps"], sol["nfev"]
+    if n_species == 2:
+        out["P"], out["D"] = out["X"][..., 0, :], out["X"][..., 1, :]
+    return out
@@ -0,0 +1,314 @@
+"""
+Integradores numéricos genéricos para sistemas y' = f(t, y).
+Trabajan sobre arreglos NumPy de cualquier forma (un sistema, o un lote
+de sistemas apilados), de modo que sirven tanto para Lotka-Volterra
+clásico como para variantes vectorizadas.
+
+`INTEGRATORS` es el registro único de métodos (Euler, Heun, punto medio,
+RK4, Adams-Bashforth 4 y RK45) que comparten el Simulador, la Comparativa
+y la escena de video a través de `integrate`.
+"""
+
+import numpy as np
+
+# ============================================================
+# TABLA DE BUTCHER: DORMAND-PRINCE 5(4)
+# ============================================================
+
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+
+DP_A = [np.array(row) for row in (
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+)]
+
+# Pesos de la solución de orden 5 (FSAL: coinciden con la última fila de A)
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+
+# Diferencia entre las soluciones de orden 5 y 4 (estimador del error local)
+DP_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+# Salida densa de orden 4: y(t + θh) = y + h Σ k_i (DP_P[i] · [θ, θ², θ³, θ⁴])
+DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+# Control de paso
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+ERROR_EXPONENT = -1 / 5
+
+# ============================================================
+# UTILIDADES
+# ============================================================
+
+def _combine(coeffs, K):
+    """Σ coeffs[i] · K[i] como un único producto matricial (más barato que tensordot)."""
+    n = coeffs.shape[0]
+    return (coeffs @ K[:n].reshape(n, -1)).reshape(K.shape[1:])
+
+
+def _rms_norm(x):
+    return np.sqrt(np.mean(np.square(x)))
+
+
+def _initial_step(f, t0, y0, f0, rtol, atol):
+    """Estimación del primer paso (Hairer, Nørsett & Wanner, II.4)."""
+    scale = atol + rtol * np.abs(y0)
+    d0 = _rms_norm(y0 / scale)
+    d1 = _rms_norm(f0 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    f1 = f(t0 + h0, y0 + h0 * f0)
+    d2 = _rms_norm((f1 - f0) / scale) / h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+
+    return min(100 * h0, h1)
+
+
+def dense_eval(y, h, K, theta):
+    """
+    Evalúa el interpolante de un paso aceptado en las fracciones `theta`.
+
+    Args:
+        y: Estado al inicio del paso.
+        h: Tamaño del paso.
+        K: Etapas del paso, forma (7, *y.shape).
+        theta: Fracciones del paso en [0, 1], forma (m,).
+
+    Returns:
+        ndarray de forma (m, *y.shape).
+    """
+    theta = np.asarray(theta, dtype=float)
+    powers = np.cumprod(np.repeat(theta[None, :], 4, axis=0), axis=0)   # (4, m)
+    coeffs = DP_P @ powers                                              # (7, m)
+    m = theta.size
+    return y + h * (coeffs.T @ K.reshape(7, -1)).reshape((m,) + K.shape[1:])
+
+# ============================================================
+# INTEGRADOR ADAPTATIVO RK45 (DORMAND-PRINCE)
+# ============================================================
+
+def dopri5(f, y0, t_span, t_eval=None, rtol=1e-6, atol=1e-9, h0=None, max_steps=100_000):
+    """
+    Integra y' = f(t, y) con Dormand-Prince 5(4), control de error y salida densa.
+
+    Args:
+        f (callable): f(t, y) -> arreglo con la misma forma que y.
+        y0 (array_like): Estado inicial (cualquier forma).
+        t_span (tuple): (t0, tf).
+        t_eval (array_like | None): Instantes crecientes en [t0, tf] donde se
+            desea la solución. Si es None se devuelven los pasos aceptados.
+        rtol, atol (float): Tolerancias relativa y absoluta.
+        h0 (float | None): Paso inicial (None = estimación automática).
+        max_steps (int): Límite de pasos aceptados + rechazados.
+
+    Returns:
+        dict: {"t": (m,), "y": (m, *y0.shape), "n_steps": int,
+               "n_rejected": int, "nfev": int}
+    """
+    t0, tf = float(t_span[0]), float(t_span[1])
+    y = np.array(y0, dtype=float)
+
+    K = np.empty((7,) + y.shape)
+    K[0] = f(t0, y)
+    nfev = 1
+
+    if h0 is None:
+        h = _initial_step(f, t0, y, K[0], rtol, atol)
+        nfev += 1
+    else:
+        h = float(h0)
+
+    if t_eval is None:
+        ts, ys = [t0], [y.copy()]
+    else:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if t_eval.size and (t_eval[0] < t0 or t_eval[-1] > tf or np.any(np.diff(t_eval) < 0)):
+            raise ValueError("t_eval debe ser creciente y estar dentro de t_span.")
+        y_out = np.empty((t_eval.size,) + y.shape)
+        # Puntos que caen exactamente en t0
+        i_eval = int(np.searchsorted(t_eval, t0, side="right"))
+        y_out[:i_eval] = y
+
+    t = t0
+    n_steps = n_rejected = 0
+
+    while t < tf:
+        if n_steps + n_rejected >= max_steps:
+            raise RuntimeError(f"dopri5: se superó el máximo de {max_steps} pasos en t={t:.6g}")
+
+        h = min(h, tf - t)
+
+        for i in range(1, 7):
+            K[i] = f(t + DP_C[i] * h, y + h * _combine(DP_A[i], K))
+        y_new = y + h * _combine(DP_B[:6], K)
+        K[6] = f(t + h, y_new)
+        nfev += 6
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err_norm = _rms_norm(h * _combine(DP_E, K) / scale)
+
+        if err_norm <= 1.0:
+            t_new = t + h if h < tf - t else tf
+
+            if t_eval is None:
+                ts.append(t_new)
+                ys.append(y_new.copy())
+            else:
+                j_eval = int(np.searchsorted(t_eval, t_new, side="right"))
+                if j_eval > i_eval:
+                    theta = (t_eval[i_eval:j_eval] - t) / h
+                    y_out[i_eval:j_eval] = dense_eval(y, h, K, theta)
+                    i_eval = j_eval
+
+            factor = MAX_FACTOR if err_norm == 0 else min(MAX_FACTOR, SAFETY * err_norm ** ERROR_EXPONENT)
+            t, y = t_new, y_new
+            K[0] = K[6]
+            n_steps += 1
+        else:
+            factor = max(MIN_FACTOR, SAFETY * err_norm ** ERROR_EXPONENT)
+            n_rejected += 1
+
+        h *= factor
+
+    if t_eval is None:
+        t_out, y_out = np.array(ts), np.array(ys)
+    else:
+        t_out = t_eval
+
+    return {
+        "t": t_out,
+        "y": y_out,
+        "n_steps": n_steps,
+        "n_rejected": n_rejected,
+        "nfev": nfev,
+    }
+
+# ============================================================
+# MÉTODOS DE PASO FIJO
+# ============================================================
+
+def euler_step(f, t, y, h):
+    return y + h * f(t, y)
+
+
+def heun_step(f, t, y, h):
+    """Trapecio explícito (RK2 de Heun)."""
+    k1 = f(t, y)
+    k2 = f(t + h, y + h*k1)
+    return y + (h/2)*(k1 + k2)
+
+
+def midpoint_step(f, t, y, h):
+    """Punto medio explícito (RK2)."""
+    k1 = f(t, y)
+    k2 = f(t + 0.5*h, y + 0.5*h*k1)
+    return y + h*k2
+
+
+def rk4_step(f, t, y, h):
+    """RK4 clásico; mismas operaciones por componente que `simulation.rk4_step`."""
+    k1 = f(t, y)
+    k2 = f(t + 0.5*h, y + 0.5*h*k1)
+    k3 = f(t + 0.5*h, y + 0.5*h*k2)
+    k4 = f(t + h, y + h*k3)
+    return y + (h/6)*(k1 + 2*k2 + 2*k3 + k4)
+
+
+# Adams-Bashforth de 4 pasos: y_{n+1} = y_n + h Σ AB4_WEIGHTS[j] f_{n-j}
+AB4_WEIGHTS = np.array([55, -59, 37, -9]) / 24
+
+# ============================================================
+# REGISTRO DE MÉTODOS
+# ============================================================
+
+# evals_per_step: evaluaciones de f por paso en régimen (None = variable).
+# "step" es None en los métodos que no son de un paso (AB4 guarda
+# historia, RK45 controla su propio paso).
+INTEGRATORS = {
+    "euler":    {"label": "Euler",             "order": 1, "evals_per_step": 1,    "step": euler_step},
+    "heun":     {"label": "Heun",              "order": 2, "evals_per_step": 2,    "step": heun_step},
+    "midpoint": {"label": "Punto medio",       "order": 2, "evals_per_step": 2,    "step": midpoint_step},
+    "rk4":      {"label": "RK4",               "order": 4, "evals_per_step": 4,    "step": rk4_step},
+    "ab4":      {"label": "Adams-Bashforth 4", "order": 4, "evals_per_step": 1,    "step": None},
+    "rk45":     {"label": "RK45 (Dormand-Prince)", "order": 5, "evals_per_step": None, "step": None},
+}
+
+
+def fixed_step_nfev(method, n_steps):
+    """Evaluaciones de f de un método de paso fijo del registro en n_steps pasos."""
+    if method == "ab4":
+        # f(y0), arranque RK4 (4 por paso) y una por paso salvo en el último
+        return 1 + 4 * min(n_steps, 3) + max(n_steps - 1, 0)
+    return INTEGRATORS[method]["evals_per_step"] * n_steps
+
+
+def integrate(method, f, y0, dt, n_steps, t0=0.0, nonnegative=False, rtol=1e-8, atol=1e-9):
+    """
+    Integra y' = f(t, y) en la malla t0 + k·dt, k = 0..n_steps, con
+    cualquier método de `INTEGRATORS`. y0 puede tener cualquier forma
+    (p. ej. (2, N) para N trayectorias de Lotka-Volterra): todos los
+    métodos avanzan el lote entero en cada llamada a f.
+
+    nonnegative recorta a 0 tras cada paso (poblaciones); en AB4 la
+    historia guarda f evaluada en el estado ya recortado. RK45 usa paso
+    adaptativo con salida densa sobre la misma malla.
+
+    Returns:
+        dict: {"t": (n_steps + 1,), "y": (n_steps + 1, *y0.shape),
+               "nfev": evaluaciones de f, "n_steps": pasos internos}
+    """
+    if method not in INTEGRATORS:
+        raise ValueError(f"Método desconocido: {method!r} (opciones: {tuple(INTEGRATORS)})")
+
+    y = np.array(y0, dtype=float)
+    t = t0 + dt * np.arange(n_steps + 1)
+
+    if method == "rk45":
+        sol = dopri5(f, y, (t0, t[-1]), t_eval=t, rtol=rtol, atol=atol)
+        Y = np.maximum(sol["y"], 0.0) if nonnegative else sol["y"]
+        return {"t": t, "y": Y, "nfev": sol["nfev"], "n_steps": sol["n_steps"]}
+
+    Y = np.empty((n_steps + 1,) + y.shape)
+    Y[0] = y
+
+    if method == "ab4":
+        # Arranque con RK4 (3 pasos); después una evaluación por paso
+        F = np.empty((4,) + y.shape)                 # F[j] = f_{n-j}
+        F[0] = f(t[0], y)
+        for k in range(1, n_steps + 1):
+            if k <= 3:
+                y = rk4_step(f, t[k-1], y, dt)
+            else:
+                y = y + dt * _combine(AB4_WEIGHTS, F)
+            if nonnegative:
+                y = np.maximum(y, 0.0)
+            Y[k] = y
+            if k < n_steps:
+                F[1:] = F[:-1].copy()
+                F[0] = f(t[k], y)
+        return {"t": t, "y": Y, "nfev": fixed_step_nfev(method, n_steps), "n_steps": n_steps}
+
+    step = INTEGRATORS[method]["step"]
+    for k in range(1, n_steps + 1):
+        y = step(f, t[k-1], y, dt)
+        if nonnegative:
+            y = np.maximum(y, 0.0)
+        Y[k] = y
+    return {"t": t, "y": Y, "nfev": fixed_step_nfev(method, n_steps), "n_steps": n_steps}
@@ -0,0 +1,102 @@
+"""
+Retrato de fases sin integrar.
+Cada órbita de Lotka-Volterra es una curva de nivel de la integral
+primera H(P, D) = F(P) + G(D). Como H es separable, basta evaluar F una
+vez sobre una malla de P por órbita y despejar D de G(D) = h − F(P) en
+sus dos ramas: N órbitas cuestan una evaluación vectorizada, no N RK4.
+"""
+
+import numpy as np
+
+from backend.cache import simulate_lotka_volterra_batch_cached
+from backend.simulation import DEFAULT_PARAMS, first_integral, invert_log_linear
+
+ORBIT_POINTS = 200      # Puntos por rama (la curva cerrada tiene 2·ORBIT_POINTS + 1)
+
+
+def orbit_curves(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    n_points=ORBIT_POINTS,
+    t_max=DEFAULT_PARAMS["t_max"],
+):
+    """
+    Órbitas cerradas que pasan por cada condición inicial (P0[i], D0[i]).
+
+    Los parámetros son escalares comunes; P0 y D0 pueden ser arreglos (N,).
+    Cada curva se recorre en el sentido del flujo (antihorario), empieza en
+    el punto más cercano a su condición inicial y termina repitiéndolo.
+
+    Si P0 o D0 es 0 no hay órbita cerrada (H = inf): la solución se queda
+    en el eje y es exponencial, P0·e^{αt} o D0·e^{−γt}. Esas filas se
+    muestrean sobre un periodo linealizado, desde la condición inicial.
+
+    Si α·γ = 0 tampoco hay órbitas cerradas (ni periodo): todas las filas
+    se integran con RK4 (cacheado) hasta t_max y se submuestrean.
+
+    Returns:
+        dict: {"P": (N, 2·n_points + 1), "D": (N, 2·n_points + 1), "H": (N,)}
+    """
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    P0, D0 = np.broadcast_arrays(np.atleast_1d(np.asarray(P0, dtype=float)),
+                                 np.atleast_1d(np.asarray(D0, dtype=float)))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = first_integral(P0, D0, a, b, d, g)
+
+    if a * g == 0:
+        return _open_trajectories(a, b, d, g, P0, D0, h, n_points, t_max)
+
+    # Ejes: crecimiento de presas sin depredador o extinción de depredadores
+    t = (2*np.pi / np.sqrt(a * g)) * np.linspace(0, 1, 2 * n_points + 1)
+    out_P = P0[:, None] * np.exp(a * t)
+    out_D = D0[:, None] * np.exp(-g * t)
+
+    inner = (P0 > 0) & (D0 > 0)
+    if inner.any():
+        out_P[inner], out_D[inner] = _closed_orbits(a, b, d, g, P0[inner], D0[inner], h[inner], n_points)
+
+    return {"P": out_P, "D": out_D, "H": h}
+
+
+def _open_trajectories(a, b, d, g, P0, D0, h, n_points, t_max):
+    """Trayectorias RK4 sobre [0, t_max] cuando no hay órbitas cerradas (α·γ = 0)."""
+    batch = simulate_lotka_volterra_batch_cached(a, b, d, g, P0, D0, t_max)
+    idx = np.round(np.linspace(0, batch["P"].shape[1] - 1, 2 * n_points + 1)).astype(int)
+    return {"P": batch["P"][:, idx], "D": batch["D"][:, idx], "H": h}
+
+
+def _closed_orbits(a, b, d, g, P0, D0, h, n_points):
+    """Curvas de nivel H = h de condiciones iniciales en el interior (P0, D0 > 0)."""
+    G_min = a - a * np.log(a / b)                       # G(D*) con D* = α/β
+
+    # Extremos en P de cada órbita: F(P) = h − G_min
+    P_lo, P_hi = invert_log_linear(d, g, h - G_min)
+
+    # Malla en P con espaciado coseno (más densa donde la curva gira)
+    s = 0.5 * (1 - np.cos(np.linspace(0, np.pi, n_points)))
+    P = P_lo[:, None] + (P_hi - P_lo)[:, None] * s      # (N, n_points)
+
+    F = d * P - g * np.log(P)
+    D_lo, D_hi = invert_log_linear(b, a, h[:, None] - F)
+
+    # En los extremos el radicando es ~0 y el redondeo puede dar NaN: ahí D = D*
+    D_lo = np.where(np.isnan(D_lo), a / b, D_lo)
+    D_hi = np.where(np.isnan(D_hi), a / b, D_hi)
+
+    # Rama inferior con P creciente y superior de vuelta: sentido antihorario
+    curve_P = np.concatenate([P, P[:, ::-1]], axis=1)
+    curve_D = np.concatenate([D_lo, D_hi[:, ::-1]], axis=1)
+
+    # Rotar cada curva para que empiece junto a su condición inicial
+    m = curve_P.shape[1]
+    start = np.argmin(np.hypot((curve_P - P0[:, None]) / P0[:, None],
+                               (curve_D - D0[:, None]) / D0[:, None]), axis=1)
+    idx = (np.arange(m + 1)[None, :] + start[:, None]) % m
+    rows = np.arange(P0.size)[:, None]
+
+    return curve_P[rows, idx], curve_D[rows, idx]
@@ -2,6 +2,13 @@ from manim import *
 import numpy as np
 import json
 import os
+import sys
+
+# Manim carga este archivo por ruta: añadimos la raíz del proyecto para importar backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.cache import simulate_lotka_volterra_cached
+from backend.phase_portrait import orbit_curves
+from backend.simulation import lotka_volterra_rhs, summarize
 
 # ============================================================
 # CONFIGURACIÓN DE ESTILO (CYBERPUNK / PRO)
@@ -18,33 +25,6 @@ COL_GLOW = "#ffffff"
 COL_NULL = "#4c566a"
 COL_EQ = "#ebcb8b"
 
-# ============================================================
-# MOTORES MATEMÁTICOS (RK4)
-# ============================================================
-
-def rhs_lotka(t, y, a, b, d, g):
-    P, D = y
-    return np.array([
-        a * P - b * P * D,
-        d * P * D - g * D
-    ])
-
-def rk4_lotka(a, b, d, g, P0, D0, t0=0, tf=50, h=0.05):
-    t = np.arange(t0, tf + h, h)
-    Y = np.zeros((len(t), 2))
-    Y[0] = [P0, D0]
-
-    for i in range(1, len(t)):
-        ti = t[i - 1]
-        yi = Y[i - 1]
-        k1 = rhs_lotka(ti, yi, a, b, d, g)
-        k2 = rhs_lotka(ti + h/2, yi + h*k1/2, a, b, d, g)
-        k3 = rhs_lotka(ti + h/2, yi + h*k2/2, a, b, d, g)
-        k4 = rhs_lotka(ti + h, yi + h*k3, a, b, d, g)
-        Y[i] = yi + (h/6)*(k1 + 2*k2 + 2*k3 + k4)
-
-    return t, Y[:,0], Y[:,1]
-
 # ============================================================
 # UTILIDADES VISUALES (EFECTOS)
 # ============================================================
@@ -136,8 +116,8 @@ class VideoLotkaProV2(Scene):
         P0, D0, tmax = params["P0"], params["D0"], params["tmax"]
 
         # Punto de equilibrio
-        P_eq = g / d
-        D_eq = a / b
+        summary = summarize(a, b, d, g, P0, D0)
+        P_eq, D_eq = summary["P_eq"], summary["D_eq"]
 
         self.camera.background_color = BG_COLOR
 
@@ -277,7 +257,10 @@ class VideoLotkaProV2(Scene):
         # SLIDE 3 — SERIE TEMPORAL
         # =====================================================
 
-        t_arr, P_arr, D_arr = rk4_lotka(a, b, d, g, P0, D0, 0, tmax)
+        # Misma entrada de caché que el Simulador (RK4, paso por defecto): el
+        # almacén en disco comparte la trayectoria entre Dash y el render
+        sol = simulate_lotka_volterra_cached(a, b, d, g, P0, D0, tmax)
+        t_arr, P_arr, D_arr = sol["t"], sol["P"], sol["D"]
         max_val = max(np.max(P_arr), np.max(D_arr)) * 1.1
         
         # Calcular steps dinámicos para los ejes
@@ -419,9 +402,9 @@ class VideoLotkaProV2(Scene):
         def update_arrow(mob):
             coords = axPh.p2c(dot_orb.get_center())
             cur_P, cur_D = coords[0], coords[1]
-            derivs = rhs_lotka(0, [cur_P, cur_D], a, b, d, g)
+            dP, dD = lotka_volterra_rhs(cur_P, cur_D, a, b, d, g)
             scale_factor = 0.5
-            vector = np.array([derivs[0], derivs[1], 0]) * scale_factor
+            vector = np.array([dP, dD, 0]) * scale_factor
             mob.put_start_and_end_on(dot_orb.get_center(), dot_orb.get_center() + vector)
 
         vector_arrow.add_updater(update_arrow)
@@ -520,8 +503,10 @@ class VideoLotkaProV2(Scene):
         orbits = VGroup()
         legend_items = []
         
-        for pi, di, col, label in CIs:
-            _, p_vals, d_vals = rk4_lotka(a, b, d, g, pi, di, 0, tmax)
+        # Todas las órbitas como curvas de nivel de H (sin integrar)
+        orbit_set = orbit_curves(a, b, d, g, [ci[0] for ci in CIs], [ci[1] for ci in CIs], t_max=tmax)
+
+        for (pi, di, col, label), p_vals, d_vals in zip(CIs, orbit_set["P"], orbit_set["D"]):
             pts = [axM.c2p(p, d) for p, d in zip(p_vals, d_vals)]
             orb = VMobject().set_points_smoothly(pts).set_color(col).set_stroke(width=2, opacity=0.8)
             orbits.add(orb)
@@ -0,0 +1,220 @@
+"""
+Parámetros variables en el tiempo: cosecha y forzamiento estacional.
+Un calendario es una función vectorizada θ(t) (por ejemplo α(t) que cae
+durante una temporada de cosecha o γ(t) estacional). En vez de llamarla
+en cada etapa, se evalúa de una sola vez sobre la malla de medios pasos
+t_j = j·dt/2, donde caen exactamente las etapas RK4 (t_k, t_k + dt/2,
+t_k + dt), y el bucle de integración solo indexa arreglos.
+
+Los parámetros de un calendario pueden ser arreglos (N,): así N
+escenarios distintos se integran juntos en el mismo bucle, como en
+`simulate_lotka_volterra_batch`.
+"""
+
+import numpy as np
+
+from backend.simulation import (
+    DEFAULT_PARAMS,
+    NUMBA_AVAILABLE,
+    lotka_volterra_rhs,
+    resolve_backend,
+)
+
+if NUMBA_AVAILABLE:
+    from numba import njit
+
+    from backend.simulation import NUMBA_RATES
+
+# ============================================================
+# FÁBRICAS DE CALENDARIOS
+# ============================================================
+
+def make_schedule(fn, name=None):
+    """
+    Marca una función θ(t) como calendario. Debe ser vectorizada: para t
+    (m,) devuelve (m,) o (N, m) si describe N escenarios.
+    """
+    fn.is_schedule = True
+    fn.name = name or getattr(fn, "__name__", "calendario")
+    return fn
+
+
+def is_schedule(value):
+    return callable(value) and getattr(value, "is_schedule", False)
+
+
+def constant_schedule(value):
+    """θ(t) = value (escalar o (N,))."""
+    value = np.asarray(value, dtype=float)
+
+    def schedule(t):
+        return np.multiply.outer(value, np.ones_like(t, dtype=float))
+    return make_schedule(schedule, "constante")
+
+
+def piecewise_schedule(breaks, values):
+    """
+    Constante a trozos: values[..., 0] antes de breaks[0], values[..., i]
+    en [breaks[i-1], breaks[i]) y values[..., -1] desde breaks[-1].
+    values tiene len(breaks) + 1 valores en el último eje (admite (N, m + 1)).
+    """
+    breaks = np.asarray(breaks, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if breaks.ndim != 1 or np.any(np.diff(breaks) <= 0):
+        raise ValueError("breaks debe ser un arreglo 1D estrictamente creciente.")
+    if values.shape[-1:] != (breaks.size + 1,):
+        raise ValueError(
+            f"values necesita {breaks.size + 1} valores en el último eje "
+            f"(uno más que breaks); tiene forma {values.shape}."
+        )
+
+    def schedule(t):
+        return values[..., np.searchsorted(breaks, t, side="right")]
+    return make_schedule(schedule, "a trozos")
+
+
+def sinusoidal_schedule(mean, amplitude, period, phase=0.0):
+    """θ(t) = mean + amplitude·sin(2πt/period + phase); todo admite (N,)."""
+    mean, amplitude, period, phase = (np.asarray(x, dtype=float) for x in (mean, amplitude, period, phase))
+    if np.any(period <= 0):
+        raise ValueError("El período del forzamiento debe ser positivo.")
+
+    def schedule(t):
+        omega_t = np.multiply.outer(2 * np.pi / period, t)
+        return mean[..., None] + amplitude[..., None] * np.sin(omega_t + phase[..., None])
+    return make_schedule(schedule, "sinusoidal")
+
+# ============================================================
+# PRECÓMPUTO SOBRE LA MALLA DE MEDIOS PASOS
+# ============================================================
+
+def schedule_grid(value, t_half):
+    """
+    Valores de un parámetro (número, arreglo (N,) o calendario) en t_half.
+
+    Returns:
+        ndarray: (N, len(t_half)) o (1, len(t_half))
+    """
+    if is_schedule(value):
+        grid = np.asarray(value(t_half), dtype=float)
+    else:
+        grid = np.multiply.outer(np.asarray(value, dtype=float), np.ones_like(t_half))
+    if grid.ndim > 2 or grid.shape[-1] != t_half.size:
+        raise ValueError(f"Un calendario debe devolver (m,) o (N, m); devolvió {grid.shape}.")
+    return np.atleast_2d(grid)
+
+# ============================================================
+# INTEGRADOR RK4 CON PARÁMETROS PRECOMPUTADOS
+# ============================================================
+
+def rk4_step_scheduled(P, D, h, start, mid, end):
+    """
+    Un paso RK4 con parámetros distintos por etapa: `start`, `mid` y
+    `end` son las tuplas (α, β, δ, γ) en t, t + h/2 y t + h. Con
+    parámetros constantes coincide operación a operación con `rk4_step_batch`.
+    """
+    k1P, k1D = lotka_volterra_rhs(P, D, *start)
+    k2P, k2D = lotka_volterra_rhs(P + 0.5*h*k1P, D + 0.5*h*k1D, *mid)
+    k3P, k3D = lotka_volterra_rhs(P + 0.5*h*k2P, D + 0.5*h*k2D, *mid)
+    k4P, k4D = lotka_volterra_rhs(P + h*k3P, D + h*k3D, *end)
+
+    P_new = P + (h/6)*(k1P + 2*k2P + 2*k3P + k4P)
+    D_new = D + (h/6)*(k1D + 2*k2D + 2*k3D + k4D)
+
+    return np.maximum(P_new, 0.0), np.maximum(D_new, 0.0)
+
+
+def _make_rk4_fill_scheduled(rates):
+    """
+    Versión escalar (compilable con Numba) para el lote: P, D (N, n) con
+    la columna 0 ya rellena; A, B, Dl, G (N, 2n − 1) en la malla de medios
+    pasos. `rates` es el campo LV compartido (`NUMBA_RATES["lv"]`),
+    evaluado con los parámetros de cada etapa; misma aritmética que
+    `rk4_step_scheduled`.
+    """
+    def fill(P, D, dt, A, B, Dl, G):
+        for i in range(P.shape[0]):
+            Pi = P[i, 0]
+            Di = D[i, 0]
+            for k in range(1, P.shape[1]):
+                j = 2 * (k - 1)
+                k1P, k1D = rates(Pi, Di, A[i, j], B[i, j], Dl[i, j], G[i, j], 0.0, 0.0)
+                k2P, k2D = rates(Pi + 0.5*dt*k1P, Di + 0.5*dt*k1D,
+                                 A[i, j+1], B[i, j+1], Dl[i, j+1], G[i, j+1], 0.0, 0.0)
+                k3P, k3D = rates(Pi + 0.5*dt*k2P, Di + 0.5*dt*k2D,
+                                 A[i, j+1], B[i, j+1], Dl[i, j+1], G[i, j+1], 0.0, 0.0)
+                k4P, k4D = rates(Pi + dt*k3P, Di + dt*k3D,
+                                 A[i, j+2], B[i, j+2], Dl[i, j+2], G[i, j+2], 0.0, 0.0)
+
+                Pi = max(Pi + (dt/6)*(k1P + 2*k2P + 2*k3P + k4P), 0.0)
+                Di = max(Di + (dt/6)*(k1D + 2*k2D + 2*k3D + k4D), 0.0)
+                P[i, k] = Pi
+                D[i, k] = Di
+    return fill
+
+
+if NUMBA_AVAILABLE:
+    _rk4_fill_scheduled_numba = njit(cache=True)(_make_rk4_fill_scheduled(NUMBA_RATES["lv"]))
+
+
+def simulate_lotka_volterra_scheduled(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    backend="auto",
+):
+    """
+    RK4 de paso fijo con α, β, δ, γ constantes, arreglos (N,) o
+    calendarios (ver las fábricas de arriba). Una cosecha proporcional de
+    presas con esfuerzo E(t) equivale a α(t) = α − E(t); la de
+    depredadores, a γ(t) = γ + E(t).
+
+    Todo se difunde a N escenarios que avanzan juntos. Con parámetros
+    constantes el resultado coincide bit a bit con
+    `simulate_lotka_volterra_batch`.
+
+    Returns:
+        dict: {"t": (n_steps,), "P": (N, n_steps), "D": (N, n_steps),
+               "params": {"alpha": (N, n_steps), ...}} con los parámetros
+               efectivos en la malla de salida (útiles para graficar).
+    """
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+    t_half = np.arange(2 * n - 1) * (0.5 * dt)
+
+    grids = [schedule_grid(x, t_half) for x in (alpha, beta, delta, gamma)]
+    inits = [np.atleast_1d(np.asarray(x, dtype=float))[:, None] for x in (P0, D0)]
+    try:
+        A, B, Dl, G, Pi, Di = np.broadcast_arrays(*grids, *inits)
+    except ValueError:
+        raise ValueError(
+            "Los parámetros y calendarios deben describir el mismo número de escenarios (o uno solo)."
+        ) from None
+    N = A.shape[0]
+    Pi, Di = Pi[:, 0], Di[:, 0]
+
+    if resolve_backend(backend) == "numba":
+        P, D = np.empty((N, n)), np.empty((N, n))
+        P[:, 0], D[:, 0] = Pi, Di
+        _rk4_fill_scheduled_numba(P, D, float(dt), *(np.ascontiguousarray(x) for x in (A, B, Dl, G)))
+    else:
+        # Filas = medios pasos: cada etapa lee una fila contigua
+        rows = [np.ascontiguousarray(x.T) for x in (A, B, Dl, G)]
+        P, D = np.empty((n, N)), np.empty((n, N))
+        P[0], D[0] = Pi, Di
+        for k in range(1, n):
+            j = 2 * (k - 1)
+            start = tuple(x[j] for x in rows)
+            mid = tuple(x[j + 1] for x in rows)
+            end = tuple(x[j + 2] for x in rows)
+            Pi, Di = rk4_step_scheduled(Pi, Di, dt, start, mid, end)
+            P[k], D[k] = Pi, Di
+        P, D = np.ascontiguousarray(P.T), np.ascontiguousarray(D.T)
+
+    params = dict(zip(("alpha", "beta", "delta", "gamma"), (np.ascontiguousarray(x[:, ::2]) for x in (A, B, Dl, G))))
+    return {"t": t, "P": P, "D": D, "params": params}
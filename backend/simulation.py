@@ -1,5 +1,14 @@
 import numpy as np
 
+from backend.integrators import AB4_WEIGHTS, INTEGRATORS, dopri5, fixed_step_nfev, integrate
+
+# Numba es opcional: si no está instalado se usa el bucle en Python puro
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # ============================================================
 #   PARÁMETROS POR DEFECTO
 # ============================================================
@@ -25,16 +34,85 @@ def lotka_volterra_rhs(P, D, a, b, d, g):
     dD = d * P * D - g * D
     return dP, dD
 
+
+# Variantes: presa logística (capacidad K) y respuesta funcional de Holling
+MODELS = ("lv", "logistic", "holling2", "holling3")
+
+# "glv" es el sistema generalizado de n especies (backend.glv): otro estado, no otro campo
+SIMULATION_MODELS = MODELS + ("glv",)
+
+
+# Campo de cada variante:
+#     P' = αP(1 − P/K) − β f(P) D,   D' = δ f(P) D − γD
+# con f(P) = P (logística), P/(1 + βTh·P) (Holling II) o P²/(1 + βTh·P²)
+# (Holling III). Reciben iK = 1/K (0 anula el término logístico) para
+# multiplicar en vez de dividir. Aritmética pura, válida para escalares,
+# arreglos y Numba: cada variante se compila en su propio kernel y el
+# bucle de integración no decide el modelo en cada paso.
+
+def logistic_rates(P, D, a, b, d, g, iK, Th):
+    dP = P * (a * (1.0 - iK * P) - b * D)
+    dD = D * (d * P - g)
+    return dP, dD
+
+
+def holling2_rates(P, D, a, b, d, g, iK, Th):
+    fD = P / (1.0 + b * Th * P) * D
+    dP = a * P * (1.0 - iK * P) - b * fD
+    dD = d * fD - g * D
+    return dP, dD
+
+
+def holling3_rates(P, D, a, b, d, g, iK, Th):
+    P2 = P * P
+    fD = P2 / (1.0 + b * Th * P2) * D
+    dP = a * P * (1.0 - iK * P) - b * fD
+    dD = d * fD - g * D
+    return dP, dD
+
+
+def _with_model_params(rhs):
+    """Adapta un campo rhs(P, D, a, b, d, g) a la firma de las variantes (ignora iK y Th)."""
+    def rates(P, D, a, b, d, g, iK, Th):
+        return rhs(P, D, a, b, d, g)
+    return rates
+
+
+# "lv" es `lotka_volterra_rhs` con la firma común: el campo clásico vive solo ahí
+MODEL_RATES = {
+    "lv": _with_model_params(lotka_volterra_rhs),
+    "logistic": logistic_rates,
+    "holling2": holling2_rates,
+    "holling3": holling3_rates,
+}
+
+
+def model_rhs(model="lv", K=np.inf, Th=0.0):
+    """
+    Campo rhs(P, D, a, b, d, g) del modelo elegido, con K y Th fijados.
+    Para "lv" es `lotka_volterra_rhs` tal cual (mismos resultados bit a bit).
+    """
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconocido: {model!r} (opciones: {MODELS})")
+    if model == "lv":
+        return lotka_volterra_rhs
+    rates = MODEL_RATES[model]
+    iK = 1.0 / K
+
+    def rhs(P, D, a, b, d, g):
+        return rates(P, D, a, b, d, g, iK, Th)
+    return rhs
+
 # ============================================================
 #   2. INTEGRADOR RK4 ULTRA OPTIMIZADO
 # ============================================================
 
-def rk4_step(P, D, h, a, b, d, g):
-    """Un paso RK4 optimizado sin arreglos temporales."""
-    k1P, k1D = lotka_volterra_rhs(P, D, a, b, d, g)
-    k2P, k2D = lotka_volterra_rhs(P + 0.5*h*k1P, D + 0.5*h*k1D, a, b, d, g)
-    k3P, k3D = lotka_volterra_rhs(P + 0.5*h*k2P, D + 0.5*h*k2D, a, b, d, g)
-    k4P, k4D = lotka_volterra_rhs(P + h*k3P, D + h*k3D, a, b, d, g)
+def rk4_step(P, D, h, a, b, d, g, rhs=lotka_volterra_rhs):
+    """Un paso RK4 optimizado sin arreglos temporales (`rhs` elige el modelo)."""
+    k1P, k1D = rhs(P, D, a, b, d, g)
+    k2P, k2D = rhs(P + 0.5*h*k1P, D + 0.5*h*k1D, a, b, d, g)
+    k3P, k3D = rhs(P + 0.5*h*k2P, D + 0.5*h*k2D, a, b, d, g)
+    k4P, k4D = rhs(P + h*k3P, D + h*k3D, a, b, d, g)
 
     P_new = P + (h/6)*(k1P + 2*k2P + 2*k3P + k4P)
     D_new = D + (h/6)*(k1D + 2*k2D + 2*k3D + k4D)
@@ -42,7 +120,207 @@ def rk4_step(P, D, h, a, b, d, g):
     return max(P_new, 0), max(D_new, 0)
 
 # ============================================================
-#   3. SIMULACIÓN PRINCIPAL (RK4)
+#   3. KERNEL COMPILADO (NUMBA, OPCIONAL)
+# ============================================================
+
+SIMULATION_BACKENDS = ("auto", "python", "numba")
+
+# Kernels escalares de los métodos de paso fijo de `INTEGRATORS`, generados
+# por fábricas a partir del campo `rates(P, D, a, b, d, g, iK, Th)` de cada
+# modelo (`MODEL_RATES`): el campo se escribe una sola vez y cada par
+# (método, modelo) se compila en su propio kernel. Cada paso recibe la
+# primera etapa k1 = f(P, D) ya evaluada (AB4 la toma de su historia) y
+# devuelve el estado sin recortar; el bucle recorta a 0 como
+# `integrate(..., nonnegative=True)`.
+
+def _make_euler_step(rates):
+    def step(P, D, k1P, k1D, dt, a, b, d, g, iK, Th):
+        return P + dt*k1P, D + dt*k1D
+    return step
+
+
+def _make_heun_step(rates):
+    def step(P, D, k1P, k1D, dt, a, b, d, g, iK, Th):
+        k2P, k2D = rates(P + dt*k1P, D + dt*k1D, a, b, d, g, iK, Th)
+        return P + (dt/2)*(k1P + k2P), D + (dt/2)*(k1D + k2D)
+    return step
+
+
+def _make_midpoint_step(rates):
+    def step(P, D, k1P, k1D, dt, a, b, d, g, iK, Th):
+        k2P, k2D = rates(P + 0.5*dt*k1P, D + 0.5*dt*k1D, a, b, d, g, iK, Th)
+        return P + dt*k2P, D + dt*k2D
+    return step
+
+
+def _make_rk4_step(rates):
+    """Misma aritmética que `rk4_step`."""
+    def step(P, D, k1P, k1D, dt, a, b, d, g, iK, Th):
+        k2P, k2D = rates(P + 0.5*dt*k1P, D + 0.5*dt*k1D, a, b, d, g, iK, Th)
+        k3P, k3D = rates(P + 0.5*dt*k2P, D + 0.5*dt*k2D, a, b, d, g, iK, Th)
+        k4P, k4D = rates(P + dt*k3P, D + dt*k3D, a, b, d, g, iK, Th)
+        return (P + (dt/6)*(k1P + 2*k2P + 2*k3P + k4P),
+                D + (dt/6)*(k1D + 2*k2D + 2*k3D + k4D))
+    return step
+
+
+# Fábrica del paso escalar de cada método de un paso del registro
+SCALAR_STEPS = {
+    "euler": _make_euler_step,
+    "heun": _make_heun_step,
+    "midpoint": _make_midpoint_step,
+    "rk4": _make_rk4_step,
+}
+
+# Métodos de paso fijo del registro (todos menos RK45); AB4 arranca con RK4
+FIXED_STEP_METHODS = tuple(m for m, spec in INTEGRATORS.items() if spec["evals_per_step"] is not None)
+
+_AB4_W0, _AB4_W1, _AB4_W2, _AB4_W3 = (float(w) for w in AB4_WEIGHTS)
+
+
+def _make_one_step_fill(rates, step):
+    """Rellena P[1:] y D[1:] avanzando `step` desde P[0], D[0]."""
+    def fill(P, D, dt, a, b, d, g, iK, Th):
+        Pi = P[0]
+        Di = D[0]
+        for k in range(1, P.shape[0]):
+            k1P, k1D = rates(Pi, Di, a, b, d, g, iK, Th)
+            Pi, Di = step(Pi, Di, k1P, k1D, dt, a, b, d, g, iK, Th)
+            Pi = max(Pi, 0.0)
+            Di = max(Di, 0.0)
+            P[k] = Pi
+            D[k] = Di
+    return fill
+
+
+def _make_ab4_fill(rates, rk4):
+    """
+    Adams-Bashforth 4 con arranque `rk4` en los tres primeros pasos. fP, fD
+    guardan f_n (evaluada en el estado ya recortado), que es además la
+    primera etapa de RK4 en el arranque.
+    """
+    def fill(P, D, dt, a, b, d, g, iK, Th):
+        Pi = P[0]
+        Di = D[0]
+        fP, fD = rates(Pi, Di, a, b, d, g, iK, Th)
+        f1P = f1D = f2P = f2D = f3P = f3D = 0.0
+        for k in range(1, P.shape[0]):
+            if k <= 3:
+                Pi, Di = rk4(Pi, Di, fP, fD, dt, a, b, d, g, iK, Th)
+            else:
+                Pi = Pi + dt*(_AB4_W0*fP + _AB4_W1*f1P + _AB4_W2*f2P + _AB4_W3*f3P)
+                Di = Di + dt*(_AB4_W0*fD + _AB4_W1*f1D + _AB4_W2*f2D + _AB4_W3*f3D)
+            Pi = max(Pi, 0.0)
+            Di = max(Di, 0.0)
+            P[k] = Pi
+            D[k] = Di
+
+            f3P, f3D = f2P, f2D
+            f2P, f2D = f1P, f1D
+            f1P, f1D = fP, fD
+            fP, fD = rates(Pi, Di, a, b, d, g, iK, Th)
+    return fill
+
+
+def _make_fill(method, rates, steps):
+    """
+    Kernel fill(P, D, dt, a, b, d, g, iK, Th) de un método de
+    FIXED_STEP_METHODS sobre `rates`; `steps` son sus pasos escalares por
+    método (ya compilados si el kernel se va a compilar).
+    """
+    if method == "ab4":
+        return _make_ab4_fill(rates, steps["rk4"])
+    return _make_one_step_fill(rates, steps[method])
+
+
+if NUMBA_AVAILABLE:
+    # La compilación ocurre en la primera llamada y queda en caché en disco.
+    # NUMBA_RATES[modelo] y NUMBA_STEPS[modelo][método] son también las piezas
+    # de los kernels de otros módulos (reacción espacial, calendarios, sensibilidades)
+    _lv_rhs_numba = njit(cache=True)(lotka_volterra_rhs)
+    NUMBA_RATES = {
+        model: njit(cache=True)(_with_model_params(_lv_rhs_numba) if model == "lv" else rates)
+        for model, rates in MODEL_RATES.items()
+    }
+    NUMBA_STEPS = {
+        model: {method: njit(cache=True)(make(rates)) for method, make in SCALAR_STEPS.items()}
+        for model, rates in NUMBA_RATES.items()
+    }
+    _fixed_step_fills_numba = {
+        model: {method: njit(cache=True)(_make_fill(method, rates, NUMBA_STEPS[model]))
+                for method in FIXED_STEP_METHODS}
+        for model, rates in NUMBA_RATES.items()
+    }
+
+
+def resolve_backend(backend="auto"):
+    """Traduce 'auto' al mejor backend disponible y valida el nombre."""
+    if backend not in SIMULATION_BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend!r} (opciones: {SIMULATION_BACKENDS})")
+    if backend == "auto":
+        return "numba" if NUMBA_AVAILABLE else "python"
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        raise ValueError("El backend 'numba' requiere tener Numba instalado.")
+    return backend
+
+
+def rk4_trajectory(P0, D0, dt, n_steps, a, b, d, g, backend="auto",
+                   model="lv", K=np.inf, Th=0.0):
+    """
+    Avanza n_steps pasos RK4 desde (P0, D0) con el backend indicado.
+    `model`, K y Th eligen la variante del modelo (ver `MODEL_RATES`).
+
+    Returns:
+        tuple: (P, D) arreglos de longitud n_steps + 1 (incluye el estado inicial).
+    """
+    backend = resolve_backend(backend)
+    rhs = model_rhs(model, float(K), float(Th))
+
+    P = np.zeros(n_steps + 1)
+    D = np.zeros(n_steps + 1)
+    P[0], D[0] = P0, D0
+
+    a, b, d, g = float(a), float(b), float(d), float(g)
+
+    if backend == "numba":
+        _fixed_step_fills_numba[model]["rk4"](P, D, float(dt), a, b, d, g, 1.0 / float(K), float(Th))
+    else:
+        Pi, Di = P0, D0
+        for k in range(1, n_steps + 1):
+            Pi, Di = rk4_step(Pi, Di, dt, a, b, d, g, rhs)
+            P[k], D[k] = Pi, Di
+
+    return P, D
+
+
+def fixed_step_trajectory(method, P0, D0, dt, n_steps, a, b, d, g, backend="auto",
+                          model="lv", K=np.inf, Th=0.0):
+    """
+    Avanza n_steps pasos de un método de FIXED_STEP_METHODS desde (P0, D0).
+    Con Numba usa el kernel compilado del par (método, modelo); sin él,
+    `integrate(method, ..., nonnegative=True)` del registro. Ambos dan el
+    mismo resultado salvo el redondeo de la combinación de AB4.
+
+    Returns:
+        tuple: (P, D) arreglos de longitud n_steps + 1 (incluye el estado inicial).
+    """
+    if method not in FIXED_STEP_METHODS:
+        raise ValueError(f"Método de paso fijo desconocido: {method!r} (opciones: {FIXED_STEP_METHODS})")
+    a, b, d, g = float(a), float(b), float(d), float(g)
+
+    if resolve_backend(backend) == "python":
+        f = lotka_volterra_field(a, b, d, g, model_rhs(model, float(K), float(Th)))
+        Y = integrate(method, f, [P0, D0], dt, n_steps, nonnegative=True)["y"]
+        return Y[:, 0], Y[:, 1]
+
+    P = np.zeros(n_steps + 1)
+    D = np.zeros(n_steps + 1)
+    P[0], D[0] = P0, D0
+    _fixed_step_fills_numba[model][method](P, D, float(dt), a, b, d, g, 1.0 / float(K), float(Th))
+    return P, D
+
+# ============================================================
+#   4. SIMULACIÓN PRINCIPAL (RK4)
 # ============================================================
 
 def simulate_lotka_volterra(
@@ -54,24 +332,665 @@ def simulate_lotka_volterra(
     D0=DEFAULT_PARAMS["D0"],
     t_max=DEFAULT_PARAMS["t_max"],
     dt=DEFAULT_PARAMS["dt"],
+    backend="auto",
+    method="rk4",
+    rtol=1e-8,
+    atol=1e-9,
+    t_eval=None,
+    model="lv",
+    K=np.inf,
+    Th=0.0,
+    r=None,
+    A=None,
+    x0=None,
 ):
     """
     Simulación científica clásica usando RK4 optimizado.
     Ideal para dashboards (rápido + preciso).
+
+    backend: "auto" (Numba si está disponible), "numba" o "python".
+    Ambos backends producen las mismas trayectorias.
+
+    method: "rk4" (paso fijo dt), "rk45" (Dormand-Prince adaptativo con
+    control de error rtol/atol), "poisson" (splitting en coordenadas
+    logarítmicas que conserva la integral primera H; admite dt mucho mayor),
+    "periodic" (integra un solo ciclo y lo repite hasta t_max; añade
+    "period" al resultado), "canonical" (integra la forma adimensional y
+    reescala; también añade "period") o cualquier otro método del registro
+    `INTEGRATORS` ("euler", "heun", "midpoint", "ab4"; añaden "nfev").
+    En "rk45" la solución se entrega en los instantes `t_eval` mediante
+    salida densa (por defecto, la malla de paso dt) y el resultado incluye
+    "n_steps" y "nfev".
+
+    model: "lv" (clásico), "logistic" (presa con capacidad de carga K),
+    "holling2" o "holling3" (respuesta funcional con tiempo de manipulación
+    Th; admiten también K). Las variantes usan los métodos del registro:
+    los demás dependen de la estructura del modelo clásico.
+
+    model="glv" simula el LV generalizado dx/dt = x ⊙ (r + A x) de n
+    especies (`backend.glv.simulate_glv`, métodos "rk4" y "rk45"). r, A y
+    x0 que falten se toman del sistema clásico de α, β, δ, γ, P0, D0. El
+    resultado trae "X" (n, n_steps) y, con n = 2, también "P" y "D".
     """
+    if model == "glv":
+        # Import diferido: backend.glv importa este módulo
+        from backend.glv import glv_params, simulate_glv
+        return simulate_glv(
+            *glv_params(alpha, beta, delta, gamma, P0, D0, r, A, x0),
+            t_max, dt, method=method, rtol=rtol, atol=atol,
+        )
+    if model != "lv" and method not in INTEGRATORS:
+        raise ValueError(f"El método {method!r} solo admite el modelo 'lv'.")
+    if method == "rk45":
+        return simulate_lotka_volterra_adaptive(
+            alpha, beta, delta, gamma, P0, D0, t_max, dt,
+            rtol=rtol, atol=atol, t_eval=t_eval, model=model, K=K, Th=Th,
+        )
+    if method == "poisson":
+        return simulate_lotka_volterra_poisson(alpha, beta, delta, gamma, P0, D0, t_max, dt)
+    if method == "periodic":
+        return simulate_lotka_volterra_periodic(
+            alpha, beta, delta, gamma, P0, D0, t_max, dt, backend=backend,
+        )
+    if method == "canonical":
+        a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+        canon = simulate_lotka_volterra_canonical(
+            *to_canonical(a, b, d, g, P0, D0), a * t_max + 2*CANONICAL_DTAU,
+        )
+        return from_canonical(canon, a, b, d, g, t_max, dt)
+    if method not in INTEGRATORS:
+        raise ValueError(f"Método desconocido: {method!r} (opciones: {SIMULATION_METHODS})")
 
     n = int(t_max / dt) + 1
     t = np.linspace(0, t_max, n)
 
-    P = np.zeros(n)
-    D = np.zeros(n)
-    P[0], D[0] = P0, D0
+    if method != "rk4":
+        P, D = fixed_step_trajectory(method, P0, D0, dt, n - 1, alpha, beta, delta, gamma,
+                                     backend, model, K, Th)
+        return {"t": t, "P": P, "D": D, "nfev": fixed_step_nfev(method, n - 1)}
+
+    # RK4 del registro, especializado en un kernel escalar (o Numba) con la misma aritmética
+    P, D = rk4_trajectory(P0, D0, dt, n - 1, alpha, beta, delta, gamma, backend, model, K, Th)
+
+    return {"t": t, "P": P, "D": D}
+
+# ============================================================
+#   5. SIMULACIÓN ADAPTATIVA (RK45 DORMAND-PRINCE)
+# ============================================================
+
+SIMULATION_METHODS = ("poisson", "periodic", "canonical") + tuple(INTEGRATORS)
+
+def lotka_volterra_field(a, b, d, g, rhs=lotka_volterra_rhs):
+    """Campo f(t, y) con y = [P, D] (o [P, D] apilados por lotes) para integradores genéricos."""
+    def f(t, y):
+        out = np.empty_like(y)
+        out[0], out[1] = rhs(y[0], y[1], a, b, d, g)
+        return out
+    return f
+
+
+def simulate_lotka_volterra_adaptive(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    rtol=1e-8,
+    atol=1e-9,
+    t_eval=None,
+    model="lv",
+    K=np.inf,
+    Th=0.0,
+):
+    """
+    Simulación con paso adaptativo (RK45) y salida densa.
+
+    El paso se ajusta al error local, no a `dt`: `dt` solo define la malla
+    de muestreo por defecto cuando no se pasa `t_eval`. Con las tolerancias
+    por defecto la precisión es comparable a RK4 con dt=0.05 usando
+    alrededor de un tercio de los pasos.
+    """
+    if t_eval is None:
+        t_eval = np.linspace(0, t_max, int(t_max / dt) + 1)
+
+    f = lotka_volterra_field(float(alpha), float(beta), float(delta), float(gamma),
+                             model_rhs(model, float(K), float(Th)))
+    sol = dopri5(f, [P0, D0], (0.0, t_max), t_eval=t_eval, rtol=rtol, atol=atol)
+
+    Y = np.maximum(sol["y"], 0.0)
+    return {
+        "t": sol["t"],
+        "P": Y[:, 0],
+        "D": Y[:, 1],
+        "n_steps": sol["n_steps"],
+        "nfev": sol["nfev"],
+    }
+
+# ============================================================
+#   6. INTEGRADOR DE POISSON (CONSERVA LA INTEGRAL PRIMERA)
+# ============================================================
+
+# Composición de Yoshida: tres subpasos de Störmer-Verlet dan orden 4
+_YOSHIDA_W1 = 1 / (2 - 2 ** (1 / 3))
+_YOSHIDA_W0 = 1 - 2 * _YOSHIDA_W1
+YOSHIDA_WEIGHTS = (_YOSHIDA_W1, _YOSHIDA_W0, _YOSHIDA_W1)
+
+
+def first_integral(P, D, a, b, d, g):
+    """Cantidad conservada H = δP − γ ln P + βD − α ln D (admite arreglos)."""
+    return d * P - g * np.log(P) + b * D - a * np.log(D)
+
+
+INVERT_MAX_ITER = 60
+
+def invert_log_linear(c1, c2, y):
+    """
+    Resuelve c1·x − c2·ln x = y (c1, c2 > 0) en sus dos ramas, vectorizado.
+
+    H es separable: H = F(P) + G(D) con F y G de esta forma, así que las
+    curvas de nivel de H (las órbitas) se obtienen invirtiendo F y G.
+
+    Con x = x*·e^v, x* = c2/c1, la ecuación queda e^v − v = K con
+    K = (y + c2 ln x*)/c2 ≥ 1. Newton parte de cotas exteriores (−K y
+    min(√(2(K−1)), ln 2K)), donde la función convexa es positiva, y converge
+    monótonamente a cada raíz.
+
+    Returns:
+        tuple: (x_lo, x_hi) con x_lo ≤ x* ≤ x_hi; NaN donde y < mínimo.
+    """
+    c1, c2, y = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (c1, c2, y)))
+    u_star = np.log(c2 / c1)
+    K = (y + c2 * u_star) / c2
+    valid = K >= 1
+    K = np.where(valid, K, 1.0)
+
+    roots = []
+    for v in (-K, np.minimum(np.sqrt(2*(K - 1)), np.log(2*K))):
+        for _ in range(INVERT_MAX_ITER):
+            ev = np.exp(v)
+            slope = ev - 1
+            step = np.divide(ev - v - K, slope, out=np.zeros_like(v), where=slope != 0)
+            v = v - step
+            if np.all(np.abs(step) <= 1e-14 * (1 + np.abs(v))):
+                break
+        roots.append(np.where(valid, np.exp(u_star + v), np.nan))
+
+    return roots[0], roots[1]
+
+
+def summarize(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    **_,
+):
+    """
+    Resumen analítico de la órbita, sin integrar.
+
+    Equilibrio (γ/δ, α/β), periodo linealizado 2π/√(αγ), integral primera H
+    de la condición inicial y extremos de P y D sobre esa curva de nivel:
+    P es extremo cuando D = D* (y viceversa), así que basta invertir F y G.
+    Acepta un dict de parámetros completo: summarize(**params).
+
+    Con P0 o D0 = 0 no hay órbita cerrada (H = inf): la solución sigue el
+    eje, P0·e^{αt} sin depredadores o D0·e^{−γt} sin presas, y los
+    extremos son los de esa exponencial (P_max = inf si las presas crecen).
+
+    Con α·γ = 0 tampoco hay órbita cerrada ni periodo (period_linear = inf),
+    pero H se conserva: con α = 0, P decrece y D → 0, así que P_min es la
+    raíz inferior de F(P) = H y D_max se alcanza al cruzar P* (si P0 > P*);
+    con γ = 0, D crece y P → 0, y el caso es el simétrico en D. Con α = γ = 0
+    se conserva δP + βD y D → D0 + δP0/β. Los mínimos y máximos que se
+    alcanzan solo cuando t → ∞ son ínfimos y supremos.
+
+    Returns:
+        dict: {"P_eq", "D_eq", "period_linear", "H",
+               "P_min", "P_max", "D_min", "D_max"}
+    """
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    P0, D0 = float(P0), float(D0)
+    P_eq, D_eq = g / d, a / b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = float(first_integral(P0, D0, a, b, d, g))
+
+    if P0 == 0 or D0 == 0:
+        P_min, P_max = P0, (np.inf if P0 > 0 and a > 0 else P0)
+        D_min, D_max = (0.0 if g > 0 else D0), D0
+    elif g > 0 and a == 0:
+        F_min = d * P_eq - g * np.log(P_eq)
+        P_min, P_max = float(invert_log_linear(d, g, H)[0]), P0
+        D_min, D_max = 0.0, (float((H - F_min) / b) if P0 > P_eq else D0)
+    elif a > 0 and g == 0:
+        G_min = b * D_eq - a * np.log(D_eq)
+        P_min, P_max = 0.0, (float((H - G_min) / d) if D0 < D_eq else P0)
+        D_min, D_max = D0, float(invert_log_linear(b, a, H)[1])
+    elif a == 0 and g == 0:
+        P_min, P_max = 0.0, P0
+        D_min, D_max = D0, D0 + d * P0 / b
+    else:
+        F_min = d * P_eq - g * np.log(P_eq)
+        G_min = b * D_eq - a * np.log(D_eq)
+        P_min, P_max = invert_log_linear(d, g, H - G_min)
+        D_min, D_max = invert_log_linear(b, a, H - F_min)
+
+        # En el equilibrio (o por redondeo junto a él) la órbita es un punto
+        P_min, P_max, D_min, D_max = (
+            float(np.nan_to_num(x, nan=eq))
+            for x, eq in ((P_min, P_eq), (P_max, P_eq), (D_min, D_eq), (D_max, D_eq))
+        )
+
+    return {
+        "P_eq": P_eq,
+        "D_eq": D_eq,
+        "period_linear": float(2*np.pi / np.sqrt(a * g)) if a * g > 0 else np.inf,
+        "H": H,
+        "P_min": P_min,
+        "P_max": P_max,
+        "D_min": D_min,
+        "D_max": D_max,
+    }
+
+
+def verlet_log_step(x, y, h, a, b, d, g):
+    """
+    Un paso de Störmer-Verlet en x = ln P, y = ln D.
+
+    En estas coordenadas el sistema es hamiltoniano separable:
+        x' = α − β e^y,   y' = δ e^x − γ
+    y cada medio flujo se integra exactamente, por lo que H queda acotada
+    (sin deriva secular) para cualquier h estable.
+    """
+    x = x + 0.5*h*(a - b*np.exp(y))
+    y = y + h*(d*np.exp(x) - g)
+    x = x + 0.5*h*(a - b*np.exp(y))
+    return x, y
 
-    a, b, d, g = alpha, beta, delta, gamma
-    Pi, Di = P0, D0
+
+def simulate_lotka_volterra_poisson(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    order=4,
+):
+    """
+    Integrador que preserva la estructura (Poisson/simpléctico) de LV.
+
+    order=2 usa Störmer-Verlet; order=4 usa la composición de Yoshida.
+    Las poblaciones nunca se vuelven negativas (se integra ln P, ln D) y H
+    no deriva, lo que permite dt 5–10x mayores que RK4 para dibujar la
+    misma órbita en el plano de fases.
+    """
+    if order == 2:
+        weights = (1.0,)
+    elif order == 4:
+        weights = YOSHIDA_WEIGHTS
+    else:
+        raise ValueError(f"Orden no soportado: {order!r} (opciones: 2, 4)")
+
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+
+    # ln 0 = -inf es un punto fijo válido (población extinta)
+    with np.errstate(divide="ignore"):
+        x, y = np.log(float(P0)), np.log(float(D0))
+
+    X = np.empty(n)
+    Y = np.empty(n)
+    X[0], Y[0] = x, y
 
     for k in range(1, n):
-        Pi, Di = rk4_step(Pi, Di, dt, a, b, d, g)
+        for w in weights:
+            x, y = verlet_log_step(x, y, w*dt, a, b, d, g)
+        X[k], Y[k] = x, y
+
+    return {"t": t, "P": np.exp(X), "D": np.exp(Y)}
+
+# ============================================================
+#   7. DETECCIÓN DEL PERIODO Y REPETICIÓN DE UN CICLO
+# ============================================================
+
+# Distancia relativa máxima entre el estado tras un periodo y el inicial
+PERIOD_CLOSURE_TOL = 1e-4
+
+
+def hermite_interp(P0, D0, P1, D1, h, s, a, b, d, g):
+    """
+    Interpolante cúbico de Hermite entre dos muestras separadas h,
+    usando el campo LV como derivada en los extremos. s ∈ [0, 1] (admite arreglos).
+    """
+    dP0, dD0 = lotka_volterra_rhs(P0, D0, a, b, d, g)
+    dP1, dD1 = lotka_volterra_rhs(P1, D1, a, b, d, g)
+
+    s2 = s * s
+    s3 = s2 * s
+    h00 = 2*s3 - 3*s2 + 1
+    h10 = s3 - 2*s2 + s
+    h01 = -2*s3 + 3*s2
+    h11 = s3 - s2
+
+    P = h00*P0 + h10*h*dP0 + h01*P1 + h11*h*dP1
+    D = h00*D0 + h10*h*dD0 + h01*D1 + h11*h*dD1
+    return P, D
+
+
+def detect_period(P, D, dt, a, b, d, g):
+    """
+    Busca en una trayectoria muestreada la primera vuelta completa alrededor
+    del equilibrio (P*, D*) = (γ/δ, α/β).
+
+    La vuelta se detecta con el ángulo acumulado respecto al equilibrio y el
+    instante exacto se refina por bisección sobre el interpolante de Hermite,
+    buscando el cruce con la semirrecta equilibrio → estado inicial.
+
+    Returns:
+        float | None: El periodo, o None si la trayectoria no completa una vuelta.
+    """
+    Pe, De = g / d, a / b
+    angle = np.unwrap(np.arctan2(D - De, P - Pe))
+    turned = np.nonzero(np.abs(angle - angle[0]) >= 2*np.pi)[0]
+    if turned.size == 0:
+        return None
+
+    k = int(turned[0])
+    uP, uD = P[0] - Pe, D[0] - De
+
+    def side(s):
+        Ps, Ds = hermite_interp(P[k-1], D[k-1], P[k], D[k], dt, s, a, b, d, g)
+        return (Ps - Pe) * uD - (Ds - De) * uP
+
+    lo, hi = 0.0, 1.0
+    f_lo = side(lo)
+    for _ in range(50):
+        mid = 0.5 * (lo + hi)
+        f_mid = side(mid)
+        if (f_mid > 0) == (f_lo > 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+
+    return (k - 1 + 0.5 * (lo + hi)) * dt
+
+
+def simulate_lotka_volterra_periodic(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    backend="auto",
+):
+    """
+    Integra un solo periodo con RK4 y lo repite (interpolando) hasta t_max.
+
+    El coste pasa de t_max/dt pasos a T/dt pasos, con T el periodo. Si la
+    órbita no se cierra (extinción, periodo mayor que t_max) se cae de vuelta
+    a la simulación completa y "period" es None.
+
+    Returns:
+        dict: {"t", "P", "D", "period"}
+    """
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+
+    # Justo en el equilibrio la solución es constante
+    if P0 == g / d and D0 == a / b:
+        return {
+            "t": t, "P": np.full(n, float(P0)), "D": np.full(n, float(D0)),
+            "period": 2*np.pi / np.sqrt(a * g),
+        }
+
+    # Se integra por tramos de ~1 periodo linealizado hasta cerrar la vuelta
+    chunk = max(16, int(2*np.pi / np.sqrt(a * g) / dt))
+    P, D = np.array([float(P0)]), np.array([float(D0)])
+    period = None
+    while period is None and P.size < n:
+        steps = min(chunk, n - P.size)
+        Pc, Dc = rk4_trajectory(P[-1], D[-1], dt, steps, a, b, d, g, backend)
+        P, D = np.concatenate([P, Pc[1:]]), np.concatenate([D, Dc[1:]])
+        period = detect_period(P, D, dt, a, b, d, g)
+
+    if period is None:
+        return {"t": t, "P": P, "D": D, "period": None}
+
+    # Estado tras un periodo: debe coincidir con el inicial para poder repetir
+    k = min(int(period / dt), P.size - 2)
+    PT, DT = hermite_interp(P[k], D[k], P[k+1], D[k+1], dt, period / dt - k, a, b, d, g)
+    closure = np.hypot((PT - P0) / P0, (DT - D0) / D0)
+    if closure > PERIOD_CLOSURE_TOL:
+        full = simulate_lotka_volterra(a, b, d, g, P0, D0, t_max, dt, backend=backend)
+        full["period"] = None
+        return full
+
+    # Fase de cada instante dentro del ciclo → interpolación sobre las muestras del ciclo
+    phase = np.mod(t, period) / dt
+    idx = np.minimum(phase.astype(int), P.size - 2)
+    s = phase - idx
+    P_out, D_out = hermite_interp(P[idx], D[idx], P[idx+1], D[idx+1], dt, s, a, b, d, g)
+
+    return {
+        "t": t,
+        "P": np.maximum(P_out, 0.0),
+        "D": np.maximum(D_out, 0.0),
+        "period": period,
+    }
+
+# ============================================================
+#   8. SALIDA POR TRAMOS (GENERADOR)
+# ============================================================
+
+STREAM_CHUNK_SIZE = 500
+
+def iter_lotka_volterra(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    chunk_size=STREAM_CHUNK_SIZE,
+    backend="auto",
+):
+    """
+    Versión generadora de `simulate_lotka_volterra` (RK4).
+
+    Produce tuplas (t, P, D) de hasta `chunk_size` muestras cada una, sin
+    guardar la serie completa. Concatenar los tramos da exactamente el mismo
+    resultado que la simulación completa. Para cancelar basta con dejar de
+    iterar (o llamar a .close() sobre el generador).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser al menos 1.")
+
+    n = int(t_max / dt) + 1
+    step = t_max / (n - 1) if n > 1 else 0.0   # Igual que np.linspace(0, t_max, n)
+
+    Pi, Di = float(P0), float(D0)
+    k0 = 0
+    while k0 < n:
+        k1 = min(k0 + chunk_size, n)
+        t = np.arange(k0, k1) * step
+        if k1 == n:
+            t[-1] = t_max
+
+        if k0 == 0:
+            P, D = rk4_trajectory(Pi, Di, dt, k1 - 1, alpha, beta, delta, gamma, backend)
+        else:
+            P, D = rk4_trajectory(Pi, Di, dt, k1 - k0, alpha, beta, delta, gamma, backend)
+            P, D = P[1:], D[1:]
+
+        Pi, Di = P[-1], D[-1]
+        yield t, P, D
+        k0 = k1
+
+# ============================================================
+#   9. INTEGRADOR RK4 VECTORIZADO (LOTES DE TRAYECTORIAS)
+# ============================================================
+
+# Por debajo de este tamaño (sin Numba) el bucle escalar por fila es más
+# rápido que el vectorizado: el coste fijo de NumPy por paso domina
+BATCH_MIN_SIZE = 8
+
+def rk4_step_batch(P, D, h, a, b, d, g, rhs=lotka_volterra_rhs):
+    """
+    Un paso RK4 sobre N trayectorias a la vez.
+    P, D y los parámetros son arreglos (N,) (o escalares difundibles).
+    Mismas operaciones y en el mismo orden que `rk4_step`.
+    """
+    k1P, k1D = rhs(P, D, a, b, d, g)
+    k2P, k2D = rhs(P + 0.5*h*k1P, D + 0.5*h*k1D, a, b, d, g)
+    k3P, k3D = rhs(P + 0.5*h*k2P, D + 0.5*h*k2D, a, b, d, g)
+    k4P, k4D = rhs(P + h*k3P, D + h*k3D, a, b, d, g)
+
+    P_new = P + (h/6)*(k1P + 2*k2P + 2*k3P + k4P)
+    D_new = D + (h/6)*(k1D + 2*k2D + 2*k3D + k4D)
+
+    return np.maximum(P_new, 0.0), np.maximum(D_new, 0.0)
+
+
+def simulate_lotka_volterra_batch(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    model="lv",
+    K=np.inf,
+    Th=0.0,
+    method="rk4",
+    backend="auto",
+):
+    """
+    Simula N trayectorias en un único bucle RK4 vectorizado con NumPy.
+
+    alpha, beta, delta, gamma, P0, D0, K y Th pueden ser escalares o
+    arreglos de longitud N (se difunden entre sí). Todas comparten t_max,
+    dt y `model`. `method` admite cualquier método de `INTEGRATORS`: el
+    lote avanza como un único estado (2, N) y el resultado incluye "nfev".
+
+    En RK4 el bucle vectorizado solo compensa sin Numba y a partir de
+    BATCH_MIN_SIZE trayectorias: con Numba, o con lotes pequeños, cada fila
+    pasa por `rk4_trajectory` (mismo resultado bit a bit).
+
+    Returns:
+        dict: {"t": (n_steps,), "P": (N, n_steps), "D": (N, n_steps)}
+    """
+    a, b, d, g, Pi, Di, K, Th = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float))
+          for x in (alpha, beta, delta, gamma, P0, D0, K, Th))
+    )
+    rhs = model_rhs(model, K, Th)
+
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+
+    if method != "rk4":
+        sol = integrate(method, lotka_volterra_field(a, b, d, g, rhs), np.stack([Pi, Di]),
+                        dt, n - 1, nonnegative=True)
+        Y = sol["y"]                                                        # (n, 2, N)
+        return {"t": t, "P": np.ascontiguousarray(Y[:, 0].T), "D": np.ascontiguousarray(Y[:, 1].T),
+                "nfev": sol["nfev"]}
+
+    if resolve_backend(backend) == "numba" or Pi.size < BATCH_MIN_SIZE:
+        P = np.empty((Pi.size, n))
+        D = np.empty((Pi.size, n))
+        for i in range(Pi.size):
+            P[i], D[i] = rk4_trajectory(Pi[i], Di[i], dt, n - 1, a[i], b[i], d[i], g[i],
+                                        backend, model, K[i], Th[i])
+        return {"t": t, "P": P, "D": D}
+
+    # Filas = pasos de tiempo: cada escritura es contigua en memoria
+    P = np.empty((n, Pi.size))
+    D = np.empty((n, Di.size))
+    P[0], D[0] = Pi, Di
+
+    for k in range(1, n):
+        Pi, Di = rk4_step_batch(Pi, Di, dt, a, b, d, g, rhs)
         P[k], D[k] = Pi, Di
 
-    return {"t": t, "P": P, "D": D}
+    return {"t": t, "P": np.ascontiguousarray(P.T), "D": np.ascontiguousarray(D.T)}
+
+# ============================================================
+#   10. FORMA CANÓNICA ADIMENSIONAL
+# ============================================================
+
+# Con u = δP/γ, v = βD/α y τ = αt el sistema queda
+#     u' = u(1 − v),   v' = ρ v(u − 1),   ρ = γ/α
+# es decir, LV con parámetros (1, 1, ρ, ρ): solo ρ y (u0, v0) distinguen
+# una trayectoria, y β, δ y la escala de tiempo se recuperan reescalando.
+
+CANONICAL_DTAU = 0.01       # Paso RK4 y muestreo de la trayectoria canónica (en τ)
+
+
+def to_canonical(alpha, beta, delta, gamma, P0, D0):
+    """Devuelve (ρ, u0, v0) de la forma canónica de un problema LV."""
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    return g / a, d * float(P0) / g, b * float(D0) / a
+
+
+def simulate_lotka_volterra_canonical(rho, u0, v0, tau_max, dtau=CANONICAL_DTAU, backend="auto"):
+    """
+    Trayectoria canónica en la malla uniforme τ = 0, dτ, ... hasta cubrir
+    τ_max (RK4 de paso fijo dτ, el mismo kernel que `rk4_trajectory`) y su
+    periodo en τ (None si no se cierra). Al ser de paso fijo, continuar
+    desde el último estado da el mismo resultado que integrar de una vez.
+
+    Returns:
+        dict: {"t": τ, "P": u, "D": v, "period"}
+    """
+    n_steps = max(1, int(np.ceil(tau_max / dtau - 1e-9)))
+    u, v = rk4_trajectory(u0, v0, dtau, n_steps, 1.0, 1.0, rho, rho, backend)
+    period = detect_period(u, v, dtau, 1.0, 1.0, rho, rho)
+    return {"t": np.arange(n_steps + 1) * dtau, "P": u, "D": v, "period": period}
+
+
+def from_canonical(canon, alpha, beta, delta, gamma, t_max, dt):
+    """
+    Reconstruye la solución dimensional en t = 0, dt, ..., t_max a partir de
+    una trayectoria canónica que cubra τ ≤ α·t_max (interpolación de Hermite
+    con el campo canónico como derivada).
+
+    Returns:
+        dict: {"t", "P", "D", "period"}
+    """
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    rho = g / a
+    tau, U, V = canon["t"], canon["P"], canon["D"]
+    dtau = tau[1] - tau[0]
+
+    n = int(t_max / dt) + 1
+    t = np.linspace(0, t_max, n)
+
+    pos = a * t / dtau
+    idx = np.minimum(pos.astype(int), U.size - 2)
+    s = pos - idx
+    u, v = hermite_interp(U[idx], V[idx], U[idx+1], V[idx+1], dtau, s, 1.0, 1.0, rho, rho)
+
+    period = canon["period"]
+    return {
+        "t": t,
+        "P": np.maximum(u, 0.0) * (g / d),
+        "D": np.maximum(v, 0.0) * (a / b),
+        "period": None if period is None else period / a,
+    }
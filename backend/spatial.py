@@ -0,0 +1,413 @@
+"""
+Lotka-Volterra espacial: reacción-difusión en una rejilla 2D.
+
+    ∂P/∂t = αP − βPD + D_P ∇²P
+    ∂D/∂t = δPD − γD + D_D ∇²D
+
+Paso de Strang: medio paso de difusión, un paso RK4 de la reacción
+(punto a punto: `rk4_step_batch` sobre la rejilla entera o un kernel
+Numba con la misma aritmética) y otro
+medio paso de difusión; los medios pasos consecutivos se fusionan. La
+difusión del laplaciano de 5 puntos se resuelve de forma exacta en su
+base propia (FFT si el borde es periódico, DCT si no hay flujo), así
+que no hay límite de estabilidad dt ≤ dx²/4D y una rejilla 512×512 con
+dt = 0.05 sigue siendo viable en CPU.
+
+Las instantáneas se escriben en disco (un .npy abierto como memmap)
+según se producen; los lectores piden fotogramas sueltos sin cargar la
+simulación entera.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from scipy import fft
+
+from backend.cache import quantize
+from backend.config import SPATIAL_STORE_DIR, SPATIAL_STORE_MAX_MB
+from backend.simulation import (
+    DEFAULT_PARAMS,
+    NUMBA_AVAILABLE,
+    resolve_backend,
+    rk4_step_batch,
+)
+from backend.trajectory_store import TrajectoryStore
+
+if NUMBA_AVAILABLE:
+    from numba import njit
+
+    from backend.simulation import NUMBA_RATES, NUMBA_STEPS
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+SPATIAL_BOUNDARIES = ("neumann", "periodic")
+SPATIAL_GRID = 256              # Celdas por lado
+SPATIAL_LENGTH = 100.0          # Lado del dominio (mismas unidades que √(D·t))
+SPATIAL_DIFFUSION = (1.0, 1.0)  # (D_P, D_D)
+SPATIAL_SNAPSHOT_EVERY = 1.0    # Intervalo de tiempo entre fotogramas
+SPATIAL_NOISE = 0.01            # Ruido relativo de la condición inicial
+
+# Mismo directorio con tope de tamaño y desalojo LRU que las trayectorias
+spatial_store = TrajectoryStore(directory=SPATIAL_STORE_DIR, max_mb=SPATIAL_STORE_MAX_MB, enabled=True)
+
+# Un solo escritor por simulación, entre hilos y procesos: <sim_id>.lock se
+# crea de forma exclusiva y el escritor renueva su fecha en cada fotograma.
+# Un cerrojo sin renovar en SPATIAL_LOCK_STALE s es de un proceso caído.
+SPATIAL_LOCK_STALE = 120.0
+SPATIAL_LOCK_POLL = 0.2         # Espera entre comprobaciones del cerrojo (s)
+
+# ============================================================
+# CONDICIÓN INICIAL Y DIFUSIÓN
+# ============================================================
+
+def spatial_initial_state(P0, D0, n=SPATIAL_GRID, L=SPATIAL_LENGTH, noise=SPATIAL_NOISE, seed=0):
+    """
+    (P0, D0) homogéneo con ruido relativo y un foco gaussiano de
+    depredadores en el centro: el período de LV depende de la amplitud,
+    así que el foco se desfasa de su entorno y emite ondas.
+    """
+    rng = np.random.default_rng(seed)
+    x = (np.arange(n) + 0.5) * (L / n) - 0.5 * L
+    r2 = x[:, None]**2 + x[None, :]**2
+    bump = np.exp(-r2 / (2 * (0.05 * L)**2))
+
+    P = P0 * (1 + noise * rng.standard_normal((n, n)))
+    D = D0 * (1 + bump + noise * rng.standard_normal((n, n)))
+    return np.maximum(P, 0.0), np.maximum(D, 0.0)
+
+
+def laplacian_eigenvalues(n, dx, boundary="neumann"):
+    """
+    Autovalores 1D del laplaciano de 5 puntos en la base de la FFT
+    (periódico) o de la DCT-II (sin flujo, celdas centradas).
+    """
+    k = np.arange(n)
+    if boundary == "periodic":
+        return (2 * np.cos(2 * np.pi * k / n) - 2) / dx**2
+    if boundary == "neumann":
+        return (2 * np.cos(np.pi * k / n) - 2) / dx**2
+    raise ValueError(f"Borde desconocido: {boundary!r} (opciones: {SPATIAL_BOUNDARIES})")
+
+
+def diffusion_propagator(n, L, diffusion, h, boundary="neumann"):
+    """
+    Factores exp(h·D·λ) (2, n, m) que aplican un paso h exacto de la
+    difusión discreta a las dos especies en el espacio transformado.
+    """
+    lam = laplacian_eigenvalues(n, L / n, boundary)
+    lam_x = lam[: n // 2 + 1] if boundary == "periodic" else lam     # rfft2: último eje recortado
+    lam2 = lam[:, None] + lam_x[None, :]
+    return np.exp(h * np.asarray(diffusion, dtype=float)[:, None, None] * lam2)
+
+
+def diffuse(fields, propagator, boundary="neumann"):
+    """Aplica el propagador a fields (2, n, n) con una transformada 2D por eje."""
+    if boundary == "periodic":
+        spec = fft.rfft2(fields, axes=(-2, -1), workers=-1)
+        return fft.irfft2(spec * propagator, s=fields.shape[-2:], axes=(-2, -1), workers=-1)
+    spec = fft.dctn(fields, type=2, axes=(-2, -1), norm="ortho", workers=-1)
+    return fft.idctn(spec * propagator, type=2, axes=(-2, -1), norm="ortho", workers=-1)
+
+# ============================================================
+# REACCIÓN PUNTO A PUNTO
+# ============================================================
+
+def _make_rk4_react(rates, step):
+    """
+    Un paso RK4 de la reacción en cada celda, en el sitio (P, D planos),
+    con el campo y el paso escalar compartidos de `backend.simulation`
+    (misma aritmética que `rk4_step`).
+    """
+    def react_cells(P, D, dt, a, b, d, g):
+        for i in range(P.shape[0]):
+            k1P, k1D = rates(P[i], D[i], a, b, d, g, 0.0, 0.0)
+            Pi, Di = step(P[i], D[i], k1P, k1D, dt, a, b, d, g, 0.0, 0.0)
+            P[i] = max(Pi, 0.0)
+            D[i] = max(Di, 0.0)
+    return react_cells
+
+
+if NUMBA_AVAILABLE:
+    _rk4_react_numba = njit(cache=True)(_make_rk4_react(NUMBA_RATES["lv"], NUMBA_STEPS["lv"]["rk4"]))
+
+
+def react(fields, dt, a, b, d, g, backend="auto"):
+    """Paso RK4 de la reacción sobre fields (2, n, n) (en el sitio con Numba)."""
+    if resolve_backend(backend) == "numba":
+        fields = np.ascontiguousarray(fields)
+        _rk4_react_numba(fields[0].reshape(-1), fields[1].reshape(-1), dt, a, b, d, g)
+        return fields
+    return np.stack(rk4_step_batch(fields[0], fields[1], dt, a, b, d, g))
+
+# ============================================================
+# INTEGRACIÓN (GENERADOR DE INSTANTÁNEAS)
+# ============================================================
+
+def iter_spatial(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    n=SPATIAL_GRID,
+    L=SPATIAL_LENGTH,
+    diffusion=SPATIAL_DIFFUSION,
+    boundary="neumann",
+    snapshot_every=SPATIAL_SNAPSHOT_EVERY,
+    seed=0,
+    backend="auto",
+):
+    """
+    Genera (t, P, D) cada `snapshot_every` (redondeado a pasos enteros),
+    empezando en t = 0. P y D son (n, n) y se reutilizan entre iteraciones:
+    el consumidor debe copiarlos o escribirlos antes de pedir el siguiente.
+    backend elige el kernel de la reacción ("auto", "python", "numba").
+    """
+    if boundary not in SPATIAL_BOUNDARIES:
+        raise ValueError(f"Borde desconocido: {boundary!r} (opciones: {SPATIAL_BOUNDARIES})")
+
+    every = max(1, int(round(snapshot_every / dt)))
+    n_steps = int(t_max / dt)
+    half = diffusion_propagator(n, L, diffusion, 0.5 * dt, boundary)
+    full = half * half
+
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    fields = np.stack(spatial_initial_state(P0, D0, n, L, seed=seed))
+    yield 0.0, fields[0], fields[1]
+
+    step = 0
+    while step < n_steps:
+        m = min(every, n_steps - step)
+        # Strang: D(h/2) [R(h) D(h)]^(m−1) R(h) D(h/2), medios pasos fusionados
+        fields = diffuse(fields, half, boundary)
+        for s in range(m):
+            fields = react(fields, dt, a, b, d, g, backend)
+            fields = diffuse(fields, full if s < m - 1 else half, boundary)
+        # La difusión exacta conserva el signo salvo redondeo
+        np.maximum(fields, 0.0, out=fields)
+        step += m
+        yield step * dt, fields[0], fields[1]
+
+# ============================================================
+# VOLCADO A DISCO Y LECTURA PEREZOSA
+# ============================================================
+
+def spatial_key(alpha, beta, delta, gamma, P0, D0, t_max, dt, n, L, diffusion, boundary, snapshot_every, seed):
+    values = (alpha, beta, delta, gamma, P0, D0, t_max, dt, L, *diffusion, snapshot_every)
+    return ("spatial", boundary, int(n), int(seed)) + tuple(quantize(x) for x in values)
+
+
+def _spatial_paths(sim_id):
+    base = os.path.join(spatial_store.directory, sim_id)
+    return base + ".npy", base + ".json"
+
+
+def _lock_path(sim_id):
+    return os.path.join(spatial_store.directory, sim_id + ".lock")
+
+
+def _lock_is_stale(path):
+    try:
+        return time.time() - os.path.getmtime(path) > SPATIAL_LOCK_STALE
+    except OSError:
+        return False     # Ya liberado
+
+
+def _acquire_lock(sim_id):
+    """
+    Crea el cerrojo de la simulación (O_CREAT | O_EXCL, atómico también
+    entre procesos). Devuelve False si otro escritor lo tiene; un cerrojo
+    huérfano se retira y se reintenta una vez.
+    """
+    os.makedirs(spatial_store.directory, exist_ok=True)
+    path = _lock_path(sim_id)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not _lock_is_stale(path):
+                return False
+            logger.warning("Cerrojo huérfano de la simulación espacial %s: se retira", sim_id)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.close(fd)
+        return True
+    return False
+
+
+def _touch_lock(sim_id):
+    try:
+        os.utime(_lock_path(sim_id))
+    except OSError:
+        pass
+
+
+def _release_lock(sim_id):
+    try:
+        os.remove(_lock_path(sim_id))
+    except OSError:
+        pass
+
+
+def _spatial_complete(sim_id):
+    """True si la simulación ya está completa en disco (y renueva su posición LRU)."""
+    npy_path, _ = _spatial_paths(sim_id)
+    try:
+        if spatial_meta(sim_id)["complete"] and os.path.exists(npy_path):
+            os.utime(npy_path)
+            return True
+    except (OSError, ValueError, KeyError):
+        pass
+    return False
+
+
+def spatial_meta(sim_id):
+    """Metadatos de una simulación: "t" (tiempos escritos), "n", "L", "complete"..."""
+    with open(_spatial_paths(sim_id)[1], "r") as f:
+        return json.load(f)
+
+
+def _write_meta(sim_id, meta):
+    spatial_store._atomic_write(_spatial_paths(sim_id)[1], lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
+
+def run_spatial(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    n=SPATIAL_GRID,
+    L=SPATIAL_LENGTH,
+    diffusion=SPATIAL_DIFFUSION,
+    boundary="neumann",
+    snapshot_every=SPATIAL_SNAPSHOT_EVERY,
+    seed=0,
+    background=False,
+):
+    """
+    Simula y escribe cada fotograma en disco en cuanto se produce, en un
+    .npy (frames, 2, n, n) float32 direccionado por el hash de la clave.
+    Los metadatos registran los tiempos ya escritos, de modo que otro
+    proceso puede leer fotogramas mientras la simulación sigue. Si la
+    misma simulación ya está completa en disco no se recalcula.
+
+    Con background=True la simulación corre en un hilo y el identificador
+    se devuelve enseguida (para no bloquear un callback): el progreso se
+    sigue con `spatial_meta` ("t" crece, "complete" o "error" al terminar).
+
+    Solo escribe quien obtiene el cerrojo de la simulación, así que dos
+    hilos o workers que la pidan a la vez no se truncan el archivo: el
+    segundo sigue los fotogramas del primero (en primer plano, espera a
+    que el cerrojo se libere).
+
+    Returns:
+        str: identificador de la simulación (para `load_spatial_frame`).
+    """
+    args = (alpha, beta, delta, gamma, P0, D0, t_max, dt, n, L, diffusion, boundary, snapshot_every, seed)
+    sim_id = spatial_store.digest(spatial_key(*args))
+
+    if _spatial_complete(sim_id):
+        return sim_id
+
+    if not _acquire_lock(sim_id):
+        # Otro hilo o proceso la está escribiendo
+        if not background:
+            while os.path.exists(_lock_path(sim_id)) and not _lock_is_stale(_lock_path(sim_id)):
+                time.sleep(SPATIAL_LOCK_POLL)
+        return sim_id
+
+    # Pudo completarse entre la comprobación y el cerrojo
+    if _spatial_complete(sim_id):
+        _release_lock(sim_id)
+        return sim_id
+
+    if not background:
+        try:
+            _write_spatial(sim_id, *args)
+        finally:
+            _release_lock(sim_id)
+        return sim_id
+
+    threading.Thread(target=_write_spatial_background, args=(sim_id,) + args, daemon=True).start()
+    return sim_id
+
+
+def _write_spatial(sim_id, alpha, beta, delta, gamma, P0, D0, t_max, dt, n, L, diffusion, boundary,
+                   snapshot_every, seed):
+    every = max(1, int(round(snapshot_every / dt)))
+    n_steps = int(t_max / dt)
+    n_frames = 1 + -(-n_steps // every)
+
+    os.makedirs(spatial_store.directory, exist_ok=True)
+    npy_path, _ = _spatial_paths(sim_id)
+    frames = np.lib.format.open_memmap(npy_path, mode="w+", dtype=np.float32, shape=(n_frames, 2, n, n))
+    meta = {"n": int(n), "L": float(L), "boundary": boundary, "n_frames": n_frames, "t": [], "complete": False}
+    _write_meta(sim_id, meta)
+
+    try:
+        for k, (t, P, D) in enumerate(iter_spatial(
+            alpha, beta, delta, gamma, P0, D0, t_max, dt, n, L, diffusion, boundary, snapshot_every, seed
+        )):
+            frames[k, 0], frames[k, 1] = P, D
+            frames.flush()
+            meta["t"].append(round(t, 10))
+            _write_meta(sim_id, meta)
+            _touch_lock(sim_id)     # Latido: el cerrojo sigue vivo
+    except Exception as e:
+        # Los lectores dejan de esperar fotogramas; el error se propaga igual
+        meta["error"] = str(e)
+        _write_meta(sim_id, meta)
+        raise
+    finally:
+        del frames
+
+    meta["complete"] = True
+    _write_meta(sim_id, meta)
+    spatial_store.evict()
+
+
+def _write_spatial_background(sim_id, *args):
+    try:
+        _write_spatial(sim_id, *args)
+    except Exception:
+        # Los lectores lo ven en los metadatos ("error"); aquí solo se registra
+        logger.exception("Falló la simulación espacial %s", sim_id)
+    finally:
+        _release_lock(sim_id)
+
+
+def load_spatial_frame(sim_id, k, max_size=None):
+    """
+    Lee solo el fotograma k (memory-mapped). Con max_size se submuestrea
+    con paso entero para que el lado no supere max_size celdas.
+
+    Returns:
+        tuple: (t, P, D) con P, D (m, m) float32
+    """
+    meta = spatial_meta(sim_id)
+    if not 0 <= k < len(meta["t"]):
+        raise IndexError(f"Fotograma {k} no disponible ({len(meta['t'])} escritos).")
+
+    frames = np.load(_spatial_paths(sim_id)[0], mmap_mode="r")
+    stride = 1 if not max_size else max(1, -(-meta["n"] // int(max_size)))
+    frame = np.array(frames[k, :, ::stride, ::stride])
+    return meta["t"][k], frame[0], frame[1]
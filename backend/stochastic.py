@@ -0,0 +1,230 @@
+"""
+Simulación estocástica (ruido demográfico) de Lotka-Volterra por conjuntos.
+Con poblaciones pequeñas el modelo determinista engaña: las extinciones
+por azar dominan. Cada realización es un proceso de nacimiento y muerte
+con cuatro reacciones (su límite de campo medio es el sistema LV):
+
+    presa nace          αP     (P + 1)
+    presa es comida     βPD    (P − 1)
+    depredador nace     δPD    (D + 1)
+    depredador muere    γD     (D − 1)
+
+Todas las realizaciones avanzan juntas en arreglos NumPy: tau-leaping
+(por defecto) o SSA de Gillespie exacto. El resultado se resume en bandas
+de cuantiles y probabilidades de extinción sobre la malla de tiempo.
+"""
+
+import numpy as np
+
+from backend.simulation import DEFAULT_PARAMS
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+STOCHASTIC_METHODS = ("tau", "ssa")
+STOCHASTIC_RUNS = 1000
+STOCHASTIC_QUANTILES = (0.05, 0.5, 0.95)
+
+# Por encima de esta media la Poisson se aproxima por una normal
+# (np.random.poisson no admite medias mayores que ~1e19)
+POISSON_NORMAL_THRESHOLD = 1e7
+
+# ============================================================
+# UTILIDADES
+# ============================================================
+
+def _poisson(rng, lam):
+    """Poisson vectorizada; aproximación normal para medias enormes."""
+    lam = np.asarray(lam, dtype=float)
+    big = lam > POISSON_NORMAL_THRESHOLD
+    k = rng.poisson(np.where(big, 0.0, lam)).astype(float)
+    if np.any(big):
+        lb = lam[big]
+        k[big] = np.maximum(np.round(lb + np.sqrt(lb) * rng.standard_normal(lb.size)), 0.0)
+    return k
+
+
+def _yule_step(rng, P, dt, alpha):
+    """
+    Avanza dt un proceso de nacimiento puro (presas sin depredadores):
+    P(t + dt) − P(t) ~ Binomial negativa(P, e^{−α dt}), muestreada como
+    Poisson con media Gamma(P, e^{α dt} − 1).
+    """
+    grow = np.expm1(alpha * dt)
+    lam = rng.gamma(np.maximum(P, 1e-300), np.maximum(grow, 1e-300))
+    return P + np.where(P > 0, _poisson(rng, lam), 0.0)
+
+
+def summarize_ensemble(t, P, D, quantiles=STOCHASTIC_QUANTILES):
+    """
+    Resume un conjunto de trayectorias (N, n) sobre la malla t (n,).
+
+    Returns:
+        dict: {"t", "quantiles", "P_quantiles": (q, n), "D_quantiles": (q, n),
+               "P_mean", "D_mean", "p_extinct_P", "p_extinct_D"}
+    """
+    q = np.asarray(quantiles, dtype=float)
+    return {
+        "t": t,
+        "quantiles": tuple(quantiles),
+        "P_quantiles": np.quantile(P, q, axis=0),
+        "D_quantiles": np.quantile(D, q, axis=0),
+        "P_mean": P.mean(axis=0),
+        "D_mean": D.mean(axis=0),
+        # La extinción es absorbente: la fracción en cero ya es acumulada
+        "p_extinct_P": np.mean(P == 0, axis=0),
+        "p_extinct_D": np.mean(D == 0, axis=0),
+    }
+
+# ============================================================
+# TAU-LEAPING
+# ============================================================
+
+def tau_leaping_paths(a, b, d, g, P0, D0, t, n_runs, tau, rng):
+    """Trayectorias (n_runs, n) en la malla t con subpasos de tamaño ≤ tau."""
+    dt = t[1] - t[0] if t.size > 1 else tau
+    substeps = max(1, int(np.ceil(dt / tau - 1e-9)))
+    h = dt / substeps
+
+    P = np.full(n_runs, float(P0))
+    D = np.full(n_runs, float(D0))
+    Pt = np.empty((t.size, n_runs), dtype=np.float32)
+    Dt = np.empty((t.size, n_runs), dtype=np.float32)
+    Pt[0], Dt[0] = P, D
+
+    for k in range(1, t.size):
+        for _ in range(substeps):
+            PD = P * D
+            births = _poisson(rng, a * P * h)
+            eaten = _poisson(rng, b * PD * h)
+            pred_births = _poisson(rng, d * PD * h)
+            deaths = _poisson(rng, g * D * h)
+            P = np.maximum(P + births - eaten, 0.0)
+            D = np.maximum(D + pred_births - deaths, 0.0)
+        Pt[k], Dt[k] = P, D
+
+    return Pt.T, Dt.T
+
+# ============================================================
+# SSA (GILLESPIE) VECTORIZADO
+# ============================================================
+
+def ssa_paths(a, b, d, g, P0, D0, t, n_runs, rng):
+    """
+    Trayectorias exactas (n_runs, n) en la malla t.
+
+    Cada iteración aplica una reacción a todas las realizaciones activas,
+    cada una con su propio reloj; los arreglos activos se compactan cuando
+    alguna termina. Sin depredadores la presa es un proceso de nacimiento
+    puro con crecimiento exponencial (número de eventos sin cota), así que
+    esas realizaciones salen del bucle y se completan con `_yule_step`.
+    """
+    n = t.size
+    Pt = np.empty((n, n_runs), dtype=np.float32)
+    Dt = np.empty((n, n_runs), dtype=np.float32)
+    Pt[0], Dt[0] = P0, D0
+
+    ids = np.arange(n_runs)
+    P = np.full(n_runs, float(P0))
+    D = np.full(n_runs, float(D0))
+    clock = np.zeros(n_runs)
+    nxt = np.ones(n_runs, dtype=int)       # Siguiente índice de la malla por rellenar
+
+    yule = []                              # (ids, P, reloj, siguiente índice) sin depredadores
+
+    while ids.size:
+        a1 = a * P
+        a2 = b * P * D
+        a3 = d * P * D
+        a4 = g * D
+        a0 = a1 + a2 + a3 + a4
+
+        with np.errstate(divide="ignore"):
+            step = rng.exponential(1.0, ids.size) / a0     # a0 = 0 → inf (estado absorbente)
+        new_clock = clock + step
+
+        # El estado actual vale hasta el salto: rellenar los puntos de la malla que se cruzan
+        upto = np.searchsorted(t, new_clock, side="left")
+        for j in range(int(np.max(upto - nxt, initial=0))):
+            m = nxt + j < upto
+            Pt[nxt[m] + j, ids[m]] = P[m]
+            Dt[nxt[m] + j, ids[m]] = D[m]
+        nxt = np.maximum(nxt, upto)
+
+        u = rng.random(ids.size) * a0
+        c1 = a1
+        c2 = c1 + a2
+        c3 = c2 + a3
+        P = P + (u < c1) - ((u >= c1) & (u < c2))
+        D = D + ((u >= c2) & (u < c3)) - (u >= c3)
+        clock = new_clock
+
+        done = nxt >= n
+        no_pred = ~done & (D <= 0)
+        if np.any(no_pred):
+            yule.append((ids[no_pred], P[no_pred], clock[no_pred], nxt[no_pred]))
+        keep = ~(done | no_pred)
+        if not np.all(keep):
+            ids, P, D, clock, nxt = ids[keep], P[keep], D[keep], clock[keep], nxt[keep]
+
+    if yule:
+        ids, P, clock, nxt = (np.concatenate(parts) for parts in zip(*yule))
+        for k in range(int(nxt.min()), n):
+            m = nxt <= k
+            P[m] = _yule_step(rng, P[m], t[k] - clock[m], a)
+            clock[m] = t[k]
+            Pt[k, ids[m]] = P[m]
+            Dt[k, ids[m]] = 0.0
+
+    return Pt.T, Dt.T
+
+# ============================================================
+# SIMULACIÓN PRINCIPAL
+# ============================================================
+
+def simulate_lotka_volterra_stochastic(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    n_runs=STOCHASTIC_RUNS,
+    method="tau",
+    tau=None,
+    quantiles=STOCHASTIC_QUANTILES,
+    seed=None,
+    return_paths=False,
+):
+    """
+    Conjunto de `n_runs` realizaciones estocásticas en t = 0, dt, ..., t_max.
+
+    method: "tau" (tau-leaping con paso `tau`, por defecto dt) o "ssa"
+    (Gillespie exacto; más lento, el coste crece con el número de eventos).
+    P0 y D0 se redondean a enteros. `seed` hace reproducible el conjunto.
+
+    Returns:
+        dict: el resumen de `summarize_ensemble` y, con return_paths=True,
+        además "P" y "D" con forma (n_runs, n) en float32.
+    """
+    if method not in STOCHASTIC_METHODS:
+        raise ValueError(f"Método desconocido: {method!r} (opciones: {STOCHASTIC_METHODS})")
+
+    a, b, d, g = float(alpha), float(beta), float(delta), float(gamma)
+    P0, D0 = float(round(P0)), float(round(D0))
+    n_runs = int(n_runs)
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, t_max, int(t_max / dt) + 1)
+
+    if method == "ssa":
+        P, D = ssa_paths(a, b, d, g, P0, D0, t, n_runs, rng)
+    else:
+        P, D = tau_leaping_paths(a, b, d, g, P0, D0, t, n_runs, dt if tau is None else tau, rng)
+
+    out = summarize_ensemble(t, P, D, quantiles)
+    if return_paths:
+        out["P"], out["D"] = P, D
+    return out
@@ -0,0 +1,133 @@
+"""
+Barridos de parámetros de Lotka-Volterra.
+Recorre mallas de (α, β, δ, γ) repartiendo lotes vectorizados entre
+procesos y reduce cada trayectoria a métricas resumen (periodo, mínimos y
+máximos de P y D, deriva relativa de H), devueltas como arreglos densos.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.simulation import (
+    DEFAULT_PARAMS,
+    first_integral,
+    simulate_lotka_volterra_batch,
+)
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+SWEEP_BATCH_SIZE = 256          # Trayectorias por lote (y por tarea del pool)
+SWEEP_METRICS = ("period", "P_min", "P_max", "D_min", "D_max", "H_drift")
+
+# ============================================================
+# MÉTRICAS POR LOTE
+# ============================================================
+
+def batch_periods(P, D, dt, a, b, d, g):
+    """
+    Periodo de cada fila de un lote, promediado sobre todas las vueltas
+    completas alrededor del equilibrio. NaN si no completa ninguna.
+    """
+    Pe, De = (g / d)[:, None], (a / b)[:, None]
+    angle = np.unwrap(np.arctan2(D - De, P - Pe), axis=1)
+    swept = np.abs(angle - angle[:, :1])
+
+    turns = np.floor(swept[:, -1] / (2*np.pi))
+    target = turns * 2*np.pi
+    has_turn = turns >= 1
+
+    # Primer índice donde se alcanza la última vuelta completa
+    k = np.argmax(swept >= target[:, None], axis=1)
+    k = np.where(has_turn, np.maximum(k, 1), 1)
+    rows = np.arange(P.shape[0])
+    s0, s1 = swept[rows, k - 1], swept[rows, k]
+    frac = np.where(s1 > s0, (target - s0) / np.where(s1 > s0, s1 - s0, 1.0), 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        period = (k - 1 + frac) * dt / turns
+    return np.where(has_turn, period, np.nan)
+
+
+def batch_metrics(alpha, beta, delta, gamma, P0, D0, t_max, dt):
+    """Simula un lote y devuelve sus métricas resumen (dict de arreglos (N,))."""
+    a, b, d, g = (np.asarray(x, dtype=float) for x in (alpha, beta, delta, gamma))
+    sol = simulate_lotka_volterra_batch(a, b, d, g, P0, D0, t_max, dt)
+    P, D = sol["P"], sol["D"]
+
+    # H solo está definida salvo una constante: la deriva se mide relativa a
+    # H0 − H(P*, D*), la altura de la órbita sobre el equilibrio (> 0 fuera de él)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = first_integral(P, D, a[:, None], b[:, None], d[:, None], g[:, None])
+        H_eq = first_integral(g / d, a / b, a, b, d, g)
+        H_drift = np.max(np.abs(H - H[:, :1]), axis=1) / (H[:, 0] - H_eq)
+
+    return {
+        "period": batch_periods(P, D, dt, a, b, d, g),
+        "P_min": P.min(axis=1),
+        "P_max": P.max(axis=1),
+        "D_min": D.min(axis=1),
+        "D_max": D.max(axis=1),
+        "H_drift": H_drift,
+    }
+
+
+def _sweep_task(args):
+    # Función de módulo: debe poder serializarse para el pool de procesos
+    return batch_metrics(*args)
+
+# ============================================================
+# BARRIDO PRINCIPAL
+# ============================================================
+
+def sweep_parameters(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    batch_size=SWEEP_BATCH_SIZE,
+    workers=None,
+):
+    """
+    Barre la malla cartesiana de los valores de α, β, δ, γ (escalares o 1-D).
+
+    Las combinaciones se reparten en lotes de `batch_size` que se integran
+    vectorizados en un pool de `workers` procesos (por defecto, un proceso
+    por núcleo; workers=1 ejecuta todo en el proceso actual).
+
+    Returns:
+        dict: "alpha", "beta", "delta", "gamma" con los ejes de la malla y
+        una entrada por métrica de SWEEP_METRICS con forma
+        (len(alpha), len(beta), len(delta), len(gamma)).
+    """
+    axes = [np.atleast_1d(np.asarray(x, dtype=float)) for x in (alpha, beta, delta, gamma)]
+    shape = tuple(ax.size for ax in axes)
+    grids = [g.ravel() for g in np.meshgrid(*axes, indexing="ij")]
+    total = grids[0].size
+
+    tasks = [
+        tuple(g[i:i + batch_size] for g in grids) + (P0, D0, t_max, dt)
+        for i in range(0, total, batch_size)
+    ]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        results = [_sweep_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_sweep_task, tasks))
+
+    out = {name: ax for name, ax in zip(("alpha", "beta", "delta", "gamma"), axes)}
+    for metric in SWEEP_METRICS:
+        out[metric] = np.concatenate([r[metric] for r in results]).reshape(shape)
+    return out
@@ -0,0 +1,171 @@
+"""
+Almacén persistente de trayectorias en disco.
+Cada resultado se guarda como .npy en un directorio direccionado por
+contenido (hash de la clave de simulación) y se reabre con
+np.load(mmap_mode="r"), por lo que los aciertos sobreviven a reinicios y
+se comparten entre procesos (workers de Dash, backend de render).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from backend.config import (
+    TRAJECTORY_STORE_DIR,
+    TRAJECTORY_STORE_ENABLED,
+    TRAJECTORY_STORE_MAX_MB,
+)
+
+logger = logging.getLogger(__name__)
+
+# Arreglos que se guardan en el .npy (en este orden, como filas)
+STORED_ARRAYS = ("t", "P", "D")
+
+
+class TrajectoryStore:
+    """
+    Directorio de trayectorias con tope de tamaño y desalojo LRU.
+
+    La "antigüedad" de una entrada es su fecha de modificación, que se
+    renueva en cada acierto; al superar el tope se borran las más antiguas.
+    Las escrituras son atómicas (archivo temporal + os.replace), así que un
+    lector concurrente nunca ve un archivo a medio escribir.
+    """
+
+    def __init__(self, directory=TRAJECTORY_STORE_DIR, max_mb=TRAJECTORY_STORE_MAX_MB,
+                 enabled=TRAJECTORY_STORE_ENABLED):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --------------------------------------------------------
+    # Rutas
+    # --------------------------------------------------------
+
+    @staticmethod
+    def digest(key):
+        """Hash estable de una clave (tupla de str/float/int)."""
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, self.digest(key))
+        return base + ".npy", base + ".json"
+
+    # --------------------------------------------------------
+    # Lectura / escritura
+    # --------------------------------------------------------
+
+    def get(self, key):
+        """Devuelve el dict guardado (arreglos memory-mapped, solo lectura) o None."""
+        if not self.enabled:
+            return None
+
+        npy_path, meta_path = self._paths(key)
+        try:
+            data = np.load(npy_path, mmap_mode="r")
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            os.utime(npy_path)   # Renovar posición LRU
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        sol = dict(zip(STORED_ARRAYS, data))
+        sol.update(meta)
+        return sol
+
+    def put(self, key, sol):
+        """Guarda los arreglos t, P, D (y escalares JSON del dict) de forma atómica."""
+        if not self.enabled:
+            return
+
+        npy_path, meta_path = self._paths(key)
+        data = np.stack([np.asarray(sol[name], dtype=float) for name in STORED_ARRAYS])
+        meta = {
+            k: v for k, v in sol.items()
+            if k not in STORED_ARRAYS and (v is None or isinstance(v, (int, float, str)))
+        }
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Metadatos primero: el .npy es el que marca la entrada como completa
+            self._atomic_write(meta_path, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+            self._atomic_write(npy_path, lambda f: np.save(f, data))
+        except OSError as e:
+            # El almacén es una caché: un disco lleno o de solo lectura no debe romper la simulación
+            logger.warning("No se pudo guardar la trayectoria en disco: %s", e)
+            return
+
+        self.evict()
+
+    def _atomic_write(self, path, write):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    # --------------------------------------------------------
+    # Desalojo
+    # --------------------------------------------------------
+
+    def evict(self):
+        """Borra las trayectorias menos usadas hasta quedar bajo el tope de tamaño."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".npy"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+        except OSError:
+            return
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                meta_path = path[:-len(".npy")] + ".json"
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+            except OSError:
+                # Otro proceso pudo borrarlo (o lo tiene abierto en Windows)
+                continue
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Vacía el directorio del almacén."""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith((".npy", ".json", ".tmp")):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+trajectory_store = TrajectoryStore()
@@ -0,0 +1,77 @@
+"""
+Bandas de incertidumbre por Monte Carlo sobre los parámetros.
+Cada parámetro se muestrea uniformemente en [x − u, x + u] (recortado a
+≥ 0), las muestras se integran juntas con el RK4 vectorizado y el
+conjunto se resume en mediana y banda 5–95 %.
+"""
+
+import numpy as np
+
+from backend.cache import LRUCache, freeze, quantize
+from backend.simulation import DEFAULT_PARAMS, simulate_lotka_volterra_batch
+from backend.stochastic import summarize_ensemble
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+UNCERTAINTY_SAMPLES = 200
+UNCERTAINTY_MAX_SAMPLES = 500       # Tope de coste: nunca más muestras por petición
+UNCERTAINTY_QUANTILES = (0.05, 0.5, 0.95)
+UNCERTAINTY_SEED = 0                # Semilla fija: mismas entradas → mismas bandas
+
+uncertainty_cache = LRUCache(maxsize=32)
+
+# ============================================================
+# MUESTREO Y BANDAS
+# ============================================================
+
+def sample_parameters(values, uncertainties, n_samples, seed=UNCERTAINTY_SEED):
+    """
+    Muestras uniformes de cada parámetro en [x − u, x + u] ∩ [0, ∞).
+
+    Returns:
+        ndarray: (len(values), n_samples)
+    """
+    x = np.asarray(values, dtype=float)[:, None]
+    u = np.abs(np.asarray(uncertainties, dtype=float))[:, None]
+    lo, hi = np.maximum(x - u, 0.0), x + u
+    rng = np.random.default_rng(seed)
+    return lo + (hi - lo) * rng.random((x.shape[0], n_samples))
+
+
+def uncertainty_bands(
+    alpha=DEFAULT_PARAMS["alpha"],
+    beta=DEFAULT_PARAMS["beta"],
+    delta=DEFAULT_PARAMS["delta"],
+    gamma=DEFAULT_PARAMS["gamma"],
+    P0=DEFAULT_PARAMS["P0"],
+    D0=DEFAULT_PARAMS["D0"],
+    t_max=DEFAULT_PARAMS["t_max"],
+    dt=DEFAULT_PARAMS["dt"],
+    uncertainty=(0.0, 0.0, 0.0, 0.0),
+    n_samples=UNCERTAINTY_SAMPLES,
+):
+    """
+    Mediana y banda 5–95 % de P y D cuando (α, β, δ, γ) tienen una
+    incertidumbre ± `uncertainty` (mismas unidades que cada parámetro).
+
+    n_samples se recorta a UNCERTAINTY_MAX_SAMPLES. El resultado se cachea
+    por entradas cuantizadas (el muestreo usa semilla fija).
+
+    Returns:
+        dict: {"t", "quantiles", "P_quantiles": (3, n), "D_quantiles": (3, n),
+               "P_mean", "D_mean", "n_samples", ...}
+    """
+    n_samples = int(min(max(n_samples, 1), UNCERTAINTY_MAX_SAMPLES))
+    key = tuple(quantize(x) for x in (alpha, beta, delta, gamma, P0, D0, t_max, dt, *uncertainty)) + (n_samples,)
+
+    bands = uncertainty_cache.get(key)
+    if bands is None:
+        a, b, d, g = sample_parameters(key[:4], key[8:12], n_samples)
+        sol = simulate_lotka_volterra_batch(a, b, d, g, key[4], key[5], key[6], key[7])
+        bands = summarize_ensemble(sol["t"], sol["P"], sol["D"], UNCERTAINTY_QUANTILES)
+        bands["n_samples"] = n_samples
+        bands = freeze(bands)
+        uncertainty_cache.put(key, bands)
+    return dict(bands)
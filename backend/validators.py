@@ -59,6 +59,18 @@ def validate_inputs(a, b, d, g, P0, D0, tmax):
     return True, ""
 
 
+def validate_uncertainty(*uncertainties):
+    """
+    Valida las incertidumbres ± de los parámetros (vacío equivale a 0).
+
+    Returns:
+        tuple: (is_valid: bool, error_message: str)
+    """
+    if any(u is not None and u < 0 for u in uncertainties):
+        return False, "⛔ ERROR: La incertidumbre (±) no puede ser negativa."
+    return True, ""
+
+
 def validate_params_dict(params: dict):
     """
     Versión para diccionarios (útil para FastAPI).
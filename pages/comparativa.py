@@ -1,135 +1,132 @@
 import dash
 from dash import html, dcc, callback, Input, Output, State
 import numpy as np
+from backend.cache import LRUCache, freeze, quantize
+from backend.comparison import COMPARISON_METHODS, compare_methods
+from backend.integrators import INTEGRATORS
 
 dash.register_page(
     __name__,
     path="/comparativa",
     name="Comparativa",
-    title="Comparativa · Euler vs RK4"
+    title="Comparativa · Métodos numéricos"
 )
 
 # =============================================================================
 # FUNCIONES DE SIMULACIÓN
 # =============================================================================
+# Cada método avanza con su kernel compilado (backend.comparison) y el error
+# se mide, solo si se pide, contra una referencia RK4 con subpasos
 
-def lotka_volterra_rhs(P, D, a, b, d, g):
-    """Campo vectorial del sistema Lotka-Volterra."""
-    dP = a * P - b * P * D
-    dD = d * P * D - g * D
-    return dP, dD
+COMPARISON_MAX_STEPS = 10000
+COMPARISON_TABLE_ROWS = 200             # La tabla muestra a lo sumo estas filas (submuestreo uniforme)
+DEFAULT_METHODS = ["euler", "rk4"]
+C_ERROR = "#ff3333"
 
-def euler_step(P, D, h, a, b, d, g):
-    """Un paso del método de Euler."""
-    dP, dD = lotka_volterra_rhs(P, D, a, b, d, g)
-    P_new = P + h * dP
-    D_new = D + h * dD
-    return max(P_new, 0), max(D_new, 0)
+# Fórmula y error global de cada método (las tarjetas usan además el registro)
+METHOD_INFO = {
+    "euler":    ("yₙ₊₁ = yₙ + h·f(tₙ, yₙ)", "O(h)"),
+    "heun":     ("yₙ₊₁ = yₙ + (h/2)·(k₁ + k₂)", "O(h²)"),
+    "midpoint": ("yₙ₊₁ = yₙ + h·f(tₙ + h/2, yₙ + (h/2)·k₁)", "O(h²)"),
+    "rk4":      ("yₙ₊₁ = yₙ + (h/6)·(k₁ + 2k₂ + 2k₃ + k₄)", "O(h⁴)"),
+    "ab4":      ("yₙ₊₁ = yₙ + (h/24)·(55fₙ − 59fₙ₋₁ + 37fₙ₋₂ − 9fₙ₋₃)", "O(h⁴)"),
+}
 
-def rk4_step(P, D, h, a, b, d, g):
-    """Un paso del método RK4."""
-    k1P, k1D = lotka_volterra_rhs(P, D, a, b, d, g)
-    k2P, k2D = lotka_volterra_rhs(P + 0.5*h*k1P, D + 0.5*h*k1D, a, b, d, g)
-    k3P, k3D = lotka_volterra_rhs(P + 0.5*h*k2P, D + 0.5*h*k2D, a, b, d, g)
-    k4P, k4D = lotka_volterra_rhs(P + h*k3P, D + h*k3D, a, b, d, g)
-    
-    P_new = P + (h/6) * (k1P + 2*k2P + 2*k3P + k4P)
-    D_new = D + (h/6) * (k1D + 2*k2D + 2*k3D + k4D)
-    return max(P_new, 0), max(D_new, 0)
+comparison_cache = LRUCache(maxsize=64)
 
-def generate_comparison_data(P0, D0, h, n_steps, a, b, d, g):
-    """Genera datos comparativos entre Euler y RK4."""
-    # Arrays para almacenar resultados
-    t = np.arange(0, (n_steps + 1) * h, h)[:n_steps + 1]
-    
-    euler_P, euler_D = [P0], [D0]
-    rk4_P, rk4_D = [P0], [D0]
-    
-    # Euler
-    P_e, D_e = P0, D0
-    for _ in range(n_steps):
-        P_e, D_e = euler_step(P_e, D_e, h, a, b, d, g)
-        euler_P.append(P_e)
-        euler_D.append(D_e)
-    
-    # RK4
-    P_r, D_r = P0, D0
-    for _ in range(n_steps):
-        P_r, D_r = rk4_step(P_r, D_r, h, a, b, d, g)
-        rk4_P.append(P_r)
-        rk4_D.append(D_r)
-    
-    return {
-        't': t,
-        'euler_P': euler_P,
-        'euler_D': euler_D,
-        'rk4_P': rk4_P,
-        'rk4_D': rk4_D
-    }
+def generate_comparison_data(P0, D0, h, n_steps, a, b, d, g, methods=DEFAULT_METHODS, errors=True):
+    """Compara los métodos elegidos (y, con errors, contra la referencia) con caché LRU."""
+    methods = tuple(m for m in COMPARISON_METHODS if m in methods)
+    key = (quantize(P0), quantize(D0), quantize(h), int(n_steps)) + tuple(quantize(x) for x in (a, b, d, g))
+    data = comparison_cache.get(key + methods + (bool(errors),))
+    if data is None:
+        data = freeze(compare_methods(methods, *key, errors=errors))
+        comparison_cache.put(key + methods + (bool(errors),), data)
+    return data
 
 # =============================================================================
 # COMPONENTES DE UI
 # =============================================================================
 
-def make_iteration_row(i, t, euler_P, euler_D, rk4_P, rk4_D):
-    """Crea una fila de la tabla de iteraciones."""
-    diff_P = abs(euler_P - rk4_P)
-    diff_D = abs(euler_D - rk4_D)
-    
-    # Determinar clase según la diferencia
-    diff_class = ""
+def diff_class(diff_P, diff_D):
+    """Clase de color según el error."""
     if diff_P > 5 or diff_D > 5:
-        diff_class = "diff-high"
-    elif diff_P > 1 or diff_D > 1:
-        diff_class = "diff-medium"
-    else:
-        diff_class = "diff-low"
-    
-    return html.Tr([
-        html.Td(f"{i}", className="iter-cell iter-num"),
-        html.Td(f"{t:.2f}", className="iter-cell"),
-        html.Td(f"{euler_P:.4f}", className="iter-cell euler-cell"),
-        html.Td(f"{euler_D:.4f}", className="iter-cell euler-cell"),
-        html.Td(f"{rk4_P:.4f}", className="iter-cell rk4-cell"),
-        html.Td(f"{rk4_D:.4f}", className="iter-cell rk4-cell"),
-        html.Td(f"{diff_P:.4f}", className=f"iter-cell {diff_class}"),
-        html.Td(f"{diff_D:.4f}", className=f"iter-cell {diff_class}"),
-    ])
+        return "diff-high"
+    if diff_P > 1 or diff_D > 1:
+        return "diff-medium"
+    return "diff-low"
+
+def make_iteration_row(data, k, shown):
+    """Crea la fila de la iteración k: referencia (si hay) y, por método mostrado, valor y error."""
+    errors = "err_P" in data
+    cells = [
+        html.Td(f"{k}", className="iter-cell iter-num"),
+        html.Td(f"{data['t'][k]:.2f}", className="iter-cell"),
+    ]
+    if errors:
+        cells += [
+            html.Td(f"{data['ref_P'][k]:.4f}", className="iter-cell"),
+            html.Td(f"{data['ref_D'][k]:.4f}", className="iter-cell"),
+        ]
+    for j in shown:
+        method = data["methods"][j]
+        cells += [
+            html.Td(f"{data['P'][j, k]:.4f}", className=f"iter-cell {method}-cell"),
+            html.Td(f"{data['D'][j, k]:.4f}", className=f"iter-cell {method}-cell"),
+        ]
+        if errors:
+            err_P, err_D = data["err_P"][j, k], data["err_D"][j, k]
+            cls = diff_class(err_P, err_D)
+            cells += [
+                html.Td(f"{err_P:.4f}", className=f"iter-cell {cls}"),
+                html.Td(f"{err_D:.4f}", className=f"iter-cell {cls}"),
+            ]
+    return html.Tr(cells)
+
+def create_comparison_table(data, shown):
+    """Crea la tabla de comparación de los métodos `shown` (submuestreada si hay muchas iteraciones)."""
+    n = len(data["t"])
+    rows = np.unique(np.linspace(0, n - 1, min(n, COMPARISON_TABLE_ROWS)).astype(int))
+
+    errors = "err_P" in data
+
+    top = [
+        html.Th("n", className="th-iter", rowSpan=2),
+        html.Th("t", className="th-time", rowSpan=2),
+    ]
+    sub = []
+    if errors:
+        top.append(html.Th("REFERENCIA", className="th-time", colSpan=2))
+        sub += [html.Th("P(t)", className="th-sub"), html.Th("D(t)", className="th-sub")]
+    for j in shown:
+        method, label = data["methods"][j], data["labels"][j]
+        top.append(html.Th(label.upper(), className=f"th-{method}", colSpan=4 if errors else 2))
+        sub += [
+            html.Th("P(t)", className=f"th-sub {method}-header"),
+            html.Th("D(t)", className=f"th-sub {method}-header"),
+        ]
+        if errors:
+            sub += [
+                html.Th("|ΔP|", className="th-sub diff-header"),
+                html.Th("|ΔD|", className="th-sub diff-header"),
+            ]
 
-def create_comparison_table(data):
-    """Crea la tabla de comparación completa."""
-    rows = []
-    for i in range(len(data['t'])):
-        rows.append(make_iteration_row(
-            i, 
-            data['t'][i],
-            data['euler_P'][i], 
-            data['euler_D'][i],
-            data['rk4_P'][i], 
-            data['rk4_D'][i]
-        ))
-    
     return html.Table(
         className="comparison-table",
         children=[
-            html.Thead([
-                html.Tr([
-                    html.Th("n", className="th-iter", rowSpan=2),
-                    html.Th("t", className="th-time", rowSpan=2),
-                    html.Th("EULER", className="th-euler", colSpan=2),
-                    html.Th("RK4", className="th-rk4", colSpan=2),
-                    html.Th("DIFERENCIA", className="th-diff", colSpan=2),
-                ]),
-                html.Tr([
-                    html.Th("P(t)", className="th-sub euler-header"),
-                    html.Th("D(t)", className="th-sub euler-header"),
-                    html.Th("P(t)", className="th-sub rk4-header"),
-                    html.Th("D(t)", className="th-sub rk4-header"),
-                    html.Th("|ΔP|", className="th-sub diff-header"),
-                    html.Th("|ΔD|", className="th-sub diff-header"),
-                ])
-            ]),
-            html.Tbody(rows)
+            html.Thead([html.Tr(top), html.Tr(sub)]),
+            html.Tbody([make_iteration_row(data, k, shown) for k in rows])
+        ]
+    )
+
+def create_error_card(title, message):
+    """Tarjeta de error en lugar de los resultados."""
+    return html.Div(
+        className="graph-card wide error-card",
+        style={"border": f"1px solid {C_ERROR}", "textAlign": "center", "padding": "40px"},
+        children=[
+            html.H3(title, style={"color": C_ERROR, "fontFamily": "Orbitron"}),
+            html.P(message, style={"color": "#fff", "fontSize": "1.2rem"})
         ]
     )
 
@@ -169,7 +166,7 @@ layout = html.Div(
             children=[
                 html.H1("COMPARATIVA NUMÉRICA", className="sim-title"),
                 html.P(
-                    "EULER vs RUNGE-KUTTA 4 // ANÁLISIS DE PRECISIÓN",
+                    "MÉTODOS DE PASO FIJO vs REFERENCIA RK4 FINA // ANÁLISIS DE PRECISIÓN",
                     className="sim-desc"
                 ),
             ]
@@ -180,19 +177,12 @@ layout = html.Div(
             className="methods-grid",
             children=[
                 create_method_card(
-                    "MÉTODO DE EULER",
-                    "yₙ₊₁ = yₙ + h·f(tₙ, yₙ)",
-                    "O(h)",
-                    "1",
-                    "euler-card"
-                ),
-                create_method_card(
-                    "RUNGE-KUTTA 4",
-                    "yₙ₊₁ = yₙ + (h/6)·(k₁ + 2k₂ + 2k₃ + k₄)",
-                    "O(h⁴)",
-                    "4",
-                    "rk4-card"
-                ),
+                    INTEGRATORS[m]["label"].upper(),
+                    *METHOD_INFO[m],
+                    str(INTEGRATORS[m]["evals_per_step"]),
+                    f"{m}-card"
+                )
+                for m in COMPARISON_METHODS
             ]
         ),
 
@@ -248,10 +238,26 @@ layout = html.Div(
                                     type="number",
                                     value=10,
                                     min=3,
-                                    max=50,
+                                    max=COMPARISON_MAX_STEPS,
                                     className="param-input-modern"
                                 ),
                             ]),
+                            html.Div(className="param-item", children=[
+                                html.Label("Métodos a comparar"),
+                                dcc.Checklist(
+                                    id="comp-methods",
+                                    options=[{"label": f" {INTEGRATORS[m]['label']} ", "value": m} for m in COMPARISON_METHODS],
+                                    value=DEFAULT_METHODS,
+                                    inline=True,
+                                ),
+                            ]),
+                            html.Div(className="param-item", children=[
+                                dcc.Checklist(
+                                    id="comp-errors",
+                                    options=[{"label": " Calcular error frente a la referencia", "value": "errors"}],
+                                    value=["errors"],
+                                ),
+                            ]),
                         ]),
                         
                         # Columna derecha - Parámetros del modelo
@@ -333,7 +339,7 @@ layout = html.Div(
         html.Div(
             className="legend-box",
             children=[
-                html.H4("📊 LEYENDA DE DIFERENCIAS", className="legend-title"),
+                html.H4("📊 LEYENDA DE ERRORES (|Δ| RESPECTO A LA REFERENCIA)", className="legend-title"),
                 html.Div(className="legend-items", children=[
                     html.Div([
                         html.Span(className="legend-dot diff-low"),
@@ -377,57 +383,91 @@ layout = html.Div(
     State("comp-beta", "value"),
     State("comp-delta", "value"),
     State("comp-gamma", "value"),
+    State("comp-methods", "value"),
+    State("comp-errors", "value"),
     prevent_initial_call=False
 )
-def update_comparison(n_clicks, P0, D0, h, n_steps, alpha, beta, delta, gamma):
+def update_comparison(n_clicks, P0, D0, h, n_steps, alpha, beta, delta, gamma, methods=DEFAULT_METHODS,
+                      errors=("errors",)):
     """Actualiza la tabla de comparación."""
     # Valores por defecto si están vacíos
     P0 = P0 or 80
     D0 = D0 or 20
     h = h or 0.5
-    n_steps = n_steps or 10
+    n_steps = min(max(int(n_steps or 10), 1), COMPARISON_MAX_STEPS)
     alpha = alpha or 0.8
     beta = beta or 0.05
     delta = delta or 0.02
     gamma = gamma or 0.6
+    methods = methods or DEFAULT_METHODS
+    errors = bool(errors)
     
-    # Generar datos
-    data = generate_comparison_data(P0, D0, h, int(n_steps), alpha, beta, delta, gamma)
-    
-    # Calcular estadísticas finales
-    final_diff_P = abs(data['euler_P'][-1] - data['rk4_P'][-1])
-    final_diff_D = abs(data['euler_D'][-1] - data['rk4_D'][-1])
+    # Generar datos: un kernel compilado por método y la referencia solo si se pide
+    try:
+        data = generate_comparison_data(P0, D0, h, n_steps, alpha, beta, delta, gamma, methods, errors)
+    except (ArithmeticError, RuntimeError, ValueError) as e:
+        # Un fallo numérico no debe romper el callback: se muestra como tarjeta de error
+        return create_error_card("ERROR EN LA COMPARATIVA", str(e))
+
+    # Los métodos inestables para este h divergen a inf/NaN: no se tabulan
+    diverged_at = data["diverged_at"]
+    shown = [j for j in range(len(data["methods"])) if diverged_at[j] < 0]
+    if not shown:
+        return create_error_card(
+            "MÉTODOS INESTABLES",
+            f"Todos los métodos elegidos divergen con h = {h:g} (valores no finitos). Reduzca el paso temporal."
+        )
     
-    # Crear resumen
+    # Crear resumen: valor final, error máximo (si se pidió) y coste de cada método
+    items = [
+        html.Div(className="summary-item", children=[
+            html.Span("Tiempo final:", className="summary-label"),
+            html.Span(f"t = {data['t'][-1]:.2f}", className="summary-value"),
+        ]),
+    ]
+    if errors:
+        items.append(html.Div(className="summary-item diff-summary", children=[
+            html.Span("Referencia RK4 fina final:", className="summary-label"),
+            html.Span(f"P = {data['ref_P'][-1]:.2f}, D = {data['ref_D'][-1]:.2f}", className="summary-value"),
+        ]))
+    for j, (method, label) in enumerate(zip(data["methods"], data["labels"])):
+        if diverged_at[j] >= 0:
+            k = int(diverged_at[j])
+            items.append(html.Div(className=f"summary-item {method}-summary", children=[
+                html.Span(f"⚠️ {label}:", className="summary-label", style={"color": C_ERROR}),
+                html.Span(f"diverge en n = {k} (t = {data['t'][k]:.2f}); inestable con h = {h:g}",
+                          className="summary-value"),
+            ]))
+            continue
+        children = [
+            html.Span(f"{label} final:", className="summary-label"),
+            html.Span(f"P = {data['P'][j, -1]:.2f}, D = {data['D'][j, -1]:.2f}", className="summary-value"),
+        ]
+        if errors:
+            children.append(html.Span(
+                f"máx |ΔP| = {data['err_P'][j].max():.4g}, máx |ΔD| = {data['err_D'][j].max():.4g}",
+                className="summary-value"
+            ))
+        children.append(html.Span(f"{data['nfev'][j]} evaluaciones de f", className="summary-value"))
+        items.append(html.Div(className=f"summary-item {method}-summary", children=children))
+
     summary = html.Div(
         className="summary-box",
         children=[
             html.H3("📈 RESUMEN DE RESULTADOS", className="summary-title"),
-            html.Div(className="summary-grid", children=[
-                html.Div(className="summary-item", children=[
-                    html.Span("Tiempo final:", className="summary-label"),
-                    html.Span(f"t = {data['t'][-1]:.2f}", className="summary-value"),
-                ]),
-                html.Div(className="summary-item euler-summary", children=[
-                    html.Span("Euler final:", className="summary-label"),
-                    html.Span(f"P = {data['euler_P'][-1]:.2f}, D = {data['euler_D'][-1]:.2f}", className="summary-value"),
-                ]),
-                html.Div(className="summary-item rk4-summary", children=[
-                    html.Span("RK4 final:", className="summary-label"),
-                    html.Span(f"P = {data['rk4_P'][-1]:.2f}, D = {data['rk4_D'][-1]:.2f}", className="summary-value"),
-                ]),
-                html.Div(className="summary-item diff-summary", children=[
-                    html.Span("Diferencia total:", className="summary-label"),
-                    html.Span(f"|ΔP| = {final_diff_P:.4f}, |ΔD| = {final_diff_D:.4f}", className="summary-value"),
-                ]),
-            ])
+            html.Div(className="summary-grid", children=items)
         ]
     )
+
+    n_rows = len(data["t"])
+    title = "📋 TABLA DE ITERACIONES"
+    if n_rows > COMPARISON_TABLE_ROWS:
+        title += f" ({COMPARISON_TABLE_ROWS} de {n_rows} filas)"
     
     return html.Div([
         summary,
         html.Div(className="table-container", children=[
-            html.H3("📋 TABLA DE ITERACIONES", className="table-title"),
-            create_comparison_table(data)
+            html.H3(title, className="table-title"),
+            create_comparison_table(data, shown)
         ])
-    ])
\ No newline at end of file
+    ])
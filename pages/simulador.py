@@ -3,8 +3,15 @@ from dash import html, dcc, callback, Input, Output, State
 import plotly.graph_objects as go
 import numpy as np
 import requests
-from backend.simulation import simulate_lotka_volterra
-from backend.validators import validate_inputs
+from backend.cache import simulate_lotka_volterra_cached
+from backend.validators import validate_inputs, validate_uncertainty
+from backend.simulation import DEFAULT_PARAMS, detect_period, summarize
+from backend.downsample import lttb
+from backend.events import locate_events, peak_event
+from backend.phase_portrait import orbit_curves
+from backend.uncertainty import uncertainty_bands
+from backend.sensitivity import sensitivity_ranking
+from backend.spatial import load_spatial_frame, run_spatial, spatial_meta
 
 # ===========================================================
 # ⚙️ CONFIGURACIÓN DE RED
@@ -18,12 +25,21 @@ dash.register_page(__name__, path="/simulador", name="Simulador", title="Simulad
 # 🎨 HELPERS VISUALES (ESTILO NEON)
 # ===========================================================
 GRAPH_HEIGHT = 380
+GRAPH_WIDTH = 560                       # Ancho aprox. (px) de una tarjeta normal; "wide" ocupa dos
+GRAPH_POINTS = GRAPH_WIDTH              # ~1 punto por píxel: LTTB conserva la forma visual
+GRAPH_POINTS_WIDE = 2 * GRAPH_WIDTH
 C_CYAN = "#00f3ff"
 C_PINK = "#ff0055"
 C_GREEN = "#00ff9d"
 C_YELLOW = "#fcee0a"
 C_TEXT = "#e0e6ed"
 C_ERROR = "#ff3333"
+C_CYAN_BAND = "rgba(0,243,255,0.15)"
+C_PINK_BAND = "rgba(255,0,85,0.15)"
+SPATIAL_UI_GRID = 128                   # Rejilla del modelo espacial en la página (segundos, no minutos)
+SPATIAL_UI_CELLS = 256                  # Lado máximo del heatmap enviado al navegador
+SPATIAL_POLL_MS = 500                   # Consulta de fotogramas nuevos mientras la simulación avanza
+SPATIAL_COLORSCALES = {"P": [[0, "#02030a"], [1, C_CYAN]], "D": [[0, "#02030a"], [1, C_PINK]]}
 
 def base_fig():
     """Configuración base limpia"""
@@ -43,6 +59,16 @@ def base_fig():
     )
     return fig
 
+def first_cycle(P, D, a, b, d, g, dt=DEFAULT_PARAMS["dt"]):
+    """Recorta una órbita a su primera vuelta: en el plano de fases las demás se superponen."""
+    period = detect_period(P, D, dt, a, b, d, g)
+    if period is None:
+        return P, D
+    k = min(int(period / dt) + 2, len(P))
+    return P[:k], D[:k]
+
+PARAM_LABELS = {"alpha": "α", "beta": "β", "delta": "δ", "gamma": "γ", "P0": "P₀", "D0": "D₀"}
+
 # ===========================================================
 # 🛡️ SISTEMA DE VALIDACIÓN DE ERRORES
 # ===========================================================
@@ -69,16 +95,50 @@ def graph_no_prey(gamma, D0):
     fig.update_layout(title="1B // DECAIMIENTO (SIN PRESAS)", xaxis_title="TIEMPO", yaxis_title="POBLACIÓN")
     return fig
 
-def graph_temporal(t, P, D):
+def graph_temporal(t, P, D, period=None, peaks=None, bands=None):
+    """
+    Series temporales; `peaks` = (máximos de P, máximos de D) de locate_events
+    y `bands` = resultado de uncertainty_bands (mediana y banda 5–95 %).
+    """
     fig = base_fig()
-    fig.add_trace(go.Scatter(x=t, y=P, mode="lines", name="Presas", line=dict(color=C_CYAN, width=2)))
-    fig.add_trace(go.Scatter(x=t, y=D, mode="lines", name="Depredadores", line=dict(color=C_PINK, width=2)))
-    fig.update_layout(title="FIG 2 // DINÁMICA TEMPORAL", xaxis_title="TIEMPO", yaxis_title="POBLACIÓN")
+    if bands is not None:
+        # Las bandas son suaves: basta un submuestreo uniforme común a ambos bordes
+        idx = np.unique(np.linspace(0, bands["t"].size - 1, GRAPH_POINTS_WIDE).astype(int))
+        tb = bands["t"][idx]
+        for key, color, fill, name in (("P_quantiles", C_CYAN, C_CYAN_BAND, "Presas"),
+                                       ("D_quantiles", C_PINK, C_PINK_BAND, "Depredadores")):
+            lo, med, hi = bands[key][:, idx]
+            fig.add_trace(go.Scatter(x=tb, y=hi, mode="lines", line=dict(width=0),
+                                     showlegend=False, hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=tb, y=lo, mode="lines", line=dict(width=0), fill="tonexty",
+                                     fillcolor=fill, name=f"{name} 5–95 %", hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=tb, y=med, mode="lines", name=f"{name} mediana",
+                                     line=dict(color=color, width=1, dash="dash")))
+    tP, P = lttb(t, P, GRAPH_POINTS_WIDE)
+    tD, D = lttb(t, D, GRAPH_POINTS_WIDE)
+    fig.add_trace(go.Scatter(x=tP, y=P, mode="lines", name="Presas", line=dict(color=C_CYAN, width=2)))
+    fig.add_trace(go.Scatter(x=tD, y=D, mode="lines", name="Depredadores", line=dict(color=C_PINK, width=2)))
+    if peaks is not None:
+        # Picos con el instante exacto (interpolado), no el de la muestra más cercana
+        for peak, key, color, name in ((peaks[0], "P", C_CYAN, "Picos presas"),
+                                       (peaks[1], "D", C_PINK, "Picos depredadores")):
+            fig.add_trace(go.Scatter(
+                x=peak["t"], y=peak[key], mode="markers", name=name,
+                marker=dict(color=color, size=7, symbol="triangle-up"),
+                hovertemplate="t = %{x:.3f}<br>%{y:.2f}<extra></extra>",
+            ))
+    title = "FIG 2 // DINÁMICA TEMPORAL"
+    if period is not None:
+        title += f" (PERIODO T ≈ {period:.2f})"
+    if bands is not None:
+        title += f" · {bands['n_samples']} MUESTRAS"
+    fig.update_layout(title=title, xaxis_title="TIEMPO", yaxis_title="POBLACIÓN")
     return fig
 
 def graph_phase(P, D, a, b, d, g):
     """Plano de Fases MEJORADO con Punto de Equilibrio"""
     fig = base_fig()
+    P, D = lttb(*first_cycle(P, D, a, b, d, g), GRAPH_POINTS)
     
     # 1. Ciclo Límite
     fig.add_trace(go.Scatter(
@@ -95,12 +155,10 @@ def graph_phase(P, D, a, b, d, g):
     ))
 
     # 3. Punto de Equilibrio (Amarillo)
-    # P* = gamma/delta, D* = alpha/beta
     if d != 0 and b != 0:
-        eq_P = g / d
-        eq_D = a / b
+        summary = summarize(a, b, d, g, P[0], D[0])
         fig.add_trace(go.Scatter(
-            x=[eq_P], y=[eq_D], mode="markers",
+            x=[summary["P_eq"]], y=[summary["D_eq"]], mode="markers",
             marker=dict(color=C_YELLOW, size=10, symbol="x"),
             name="Equilibrio"
         ))
@@ -108,28 +166,27 @@ def graph_phase(P, D, a, b, d, g):
     fig.update_layout(title="FIG 3 // PLANO DE FASES (Con Equilibrio)", xaxis_title="PRESAS (P)", yaxis_title="DEPREDADORES (D)")
     return fig
 
-def graph_orbits(alpha, beta, delta, gamma, P0, D0, t_max, main_solution=None):
+def graph_orbits(alpha, beta, delta, gamma, P0, D0, t_max):
     """Muestra múltiples órbitas para ver cómo cambian"""
     fig = base_fig()
     
     # Diferentes condiciones iniciales basadas en la entrada del usuario
     escalas = [
-        (1.0, 1.0, C_CYAN, "Actual", main_solution),   # Reutilizar la simulación principal
-        (1.5, 1.5, C_GREEN, "+50%", None),    # Más población
-        (0.5, 0.5, C_PINK, "-50%", None),     # Menos población
-        (0.2, 0.2, C_YELLOW, "Mínimo", None)  # Cerca al equilibrio
+        (1.0, 1.0, C_CYAN, "Actual"),
+        (1.5, 1.5, C_GREEN, "+50%"),    # Más población
+        (0.5, 0.5, C_PINK, "-50%"),     # Menos población
+        (0.2, 0.2, C_YELLOW, "Mínimo")  # Cerca al equilibrio
     ]
-    
-    for eP, eD, color, lbl, precomputed in escalas:
-        # Si ya tenemos la solución precomputada (caso Actual), usarla
-        if precomputed is not None:
-            sol = precomputed
-        else:
-            # Simular caso hipotético
-            sol = simulate_lotka_volterra(alpha, beta, delta, gamma, P0*eP, D0*eD, t_max)
-        
+
+    # Cada órbita es una curva de nivel de H: se obtienen todas sin integrar
+    # (con α·γ = 0 no son cerradas y se integran hasta t_max)
+    eP = np.array([e[0] for e in escalas])
+    eD = np.array([e[1] for e in escalas])
+    orbits = orbit_curves(alpha, beta, delta, gamma, P0*eP, D0*eD, t_max=t_max)
+
+    for P, D, (_, _, color, lbl) in zip(orbits["P"], orbits["D"], escalas):
         fig.add_trace(go.Scatter(
-            x=sol["P"], y=sol["D"], 
+            x=P, y=D, 
             mode="lines", 
             line=dict(color=color, width=2),
             name=lbl,
@@ -139,6 +196,35 @@ def graph_orbits(alpha, beta, delta, gamma, P0, D0, t_max, main_solution=None):
     fig.update_layout(title="FIG 4 // ESTABILIDAD ORBITAL (Multi-Escenario)", xaxis_title="PRESAS", yaxis_title="DEPREDADORES")
     return fig
 
+def graph_sensitivity(ranking):
+    """¿Qué parámetro pesa más? Elasticidad RMS de P y D respecto a cada parámetro."""
+    fig = base_fig()
+    labels = [PARAM_LABELS[p] for p in ranking["params"]]
+    fig.add_trace(go.Bar(x=labels, y=ranking["P"], name="Presas", marker_color=C_CYAN))
+    fig.add_trace(go.Bar(x=labels, y=ranking["D"], name="Depredadores", marker_color=C_PINK))
+    fig.update_layout(
+        title="FIG 5 // ¿QUÉ PARÁMETRO PESA MÁS?", barmode="group", hovermode="x",
+        xaxis_title="PARÁMETRO", yaxis_title="ELASTICIDAD RMS",
+    )
+    return fig
+
+def graph_spatial(t=None, field=None, species="P", pending=False):
+    """Heatmap de un fotograma del modelo espacial (o tarjeta vacía sin simulación)."""
+    fig = base_fig()
+    name = "PRESAS" if species == "P" else "DEPREDADORES"
+    if field is None:
+        hint = "CALCULANDO…" if pending else "PULSA 🌐 SIMULAR ESPACIO"
+        fig.update_layout(title=f"FIG 6 // DINÁMICA ESPACIAL ({hint})")
+        return fig
+    fig.add_trace(go.Heatmap(z=field, colorscale=SPATIAL_COLORSCALES[species], name=name,
+                             hovertemplate="%{z:.1f}<extra></extra>"))
+    fig.update_layout(
+        title=f"FIG 6 // DINÁMICA ESPACIAL · {name} (t = {t:.1f})", hovermode="closest",
+        xaxis=dict(showgrid=False, visible=False),
+        yaxis=dict(showgrid=False, visible=False, scaleanchor="x"),
+    )
+    return fig
+
 # ===========================================================
 #   LAYOUT PRINCIPAL
 # ===========================================================
@@ -169,12 +255,22 @@ layout = html.Div(
                     html.Div([html.Label("D₀ — Depredadores Iniciales"), dcc.Input(id="D0", type="number", min=1, value=20, className="param-input-modern")], className="param-item"),
                     html.Div([html.Label("Tiempo (t)"), dcc.Slider(id="tmax", min=20, max=200, step=10, value=50, marks={50:'50', 100:'100', 200:'Max'}, className="custom-slider")], className="param-item"),
                 ], className="params-group"),
+
+                # Columna 3: Incertidumbre (0 = desactivada)
+                html.Div([
+                    html.H4("INCERTIDUMBRE (±)", className="group-title"),
+                    html.Div([html.Label("± α"), dcc.Input(id="alpha-unc", type="number", min=0, value=0, step=0.01, className="param-input-modern")], className="param-item"),
+                    html.Div([html.Label("± β"), dcc.Input(id="beta-unc", type="number", min=0, value=0, step=0.001, className="param-input-modern")], className="param-item"),
+                    html.Div([html.Label("± δ"), dcc.Input(id="delta-unc", type="number", min=0, value=0, step=0.001, className="param-input-modern")], className="param-item"),
+                    html.Div([html.Label("± γ"), dcc.Input(id="gamma-unc", type="number", min=0, value=0, step=0.01, className="param-input-modern")], className="param-item"),
+                ], className="params-group"),
             ]),
 
             # Botones
             html.Div(className="action-bar", children=[
                 html.Button("⚡ ACTUALIZAR GRÁFICOS", id="sim-button", className="btn-primary-glow"),
                 html.Button("🎬 GENERAR VIDEO", id="video-button", className="btn-secondary-glow"),
+                html.Button("🌐 SIMULAR ESPACIO", id="spatial-button", className="btn-secondary-glow"),
             ]),
 
             # Zona de Carga (Barra Quantum)
@@ -190,6 +286,21 @@ layout = html.Div(
 
         # Aquí se pintarán los gráficos (o el error)
         html.Div(id="graphs-output", className="graphs-grid-modern"),
+
+        # Modelo espacial: se simula en segundo plano y los fotogramas se leen de disco uno a uno
+        html.Div(className="graphs-grid-modern", children=[
+            html.Div(className="graph-card wide", children=[
+                dcc.Store(id="spatial-sim"),
+                dcc.Interval(id="spatial-poll", interval=SPATIAL_POLL_MS, disabled=True),
+                dcc.Graph(id="spatial-graph", figure=graph_spatial()),
+                html.Div([
+                    html.Label("Especie"),
+                    dcc.RadioItems(id="spatial-species", value="P", inline=True,
+                                   options=[{"label": " Presas ", "value": "P"}, {"label": " Depredadores ", "value": "D"}]),
+                ], className="param-item"),
+                html.Div([html.Label("Fotograma"), dcc.Slider(id="spatial-frame", min=0, max=0, step=1, value=0, className="custom-slider")], className="param-item"),
+            ]),
+        ]),
     ]
 )
 
@@ -204,10 +315,14 @@ layout = html.Div(
     State("delta", "value"), State("gamma", "value"),
     State("P0", "value"), State("D0", "value"), 
     State("tmax", "value"),
+    State("alpha-unc", "value"), State("beta-unc", "value"),
+    State("delta-unc", "value"), State("gamma-unc", "value"),
 )
-def update_graphs(click, a, b, d, g, P0, D0, tmax):
+def update_graphs(click, a, b, d, g, P0, D0, tmax, ua=0, ub=0, ud=0, ug=0):
     # 1. Validar Inputs
     is_valid, error_msg = validate_inputs(a, b, d, g, P0, D0, tmax)
+    if is_valid:
+        is_valid, error_msg = validate_uncertainty(ua, ub, ud, ug)
     
     if not is_valid:
         # Mostrar tarjeta de error visual
@@ -225,20 +340,81 @@ def update_graphs(click, a, b, d, g, P0, D0, tmax):
     a, b, d, g = float(a), float(b), float(d), float(g)
     P0, D0, tmax = float(P0), float(D0), float(tmax)
 
-    sol = simulate_lotka_volterra(a, b, d, g, P0, D0, tmax)
+    # Caché RK4 extensible: cambiar solo t reutiliza la entrada e integra el tramo nuevo
+    sol = simulate_lotka_volterra_cached(a, b, d, g, P0, D0, tmax)
     t, P, D = sol["t"], sol["P"], sol["D"]
+    period = detect_period(P, D, DEFAULT_PARAMS["dt"], a, b, d, g)
+    peaks = locate_events(t, P, D, a, b, d, g, (peak_event("P"), peak_event("D")))
+
+    # Bandas Monte Carlo solo si hay alguna incertidumbre (lote RK4 vectorizado, con tope de muestras)
+    uncertainty = tuple(float(u or 0) for u in (ua, ub, ud, ug))
+    bands = uncertainty_bands(a, b, d, g, P0, D0, tmax, uncertainty=uncertainty) if any(uncertainty) else None
 
-    # 3. Retornar Gráficos (Optimizado: reutilizamos 'sol' en graph_orbits)
+    # 3. Retornar Gráficos
     return [
         html.Div([dcc.Graph(figure=graph_no_predators(a, P0))], className="graph-card"),
         html.Div([dcc.Graph(figure=graph_no_prey(g, D0))], className="graph-card"),
-        html.Div([dcc.Graph(figure=graph_temporal(t, P, D))], className="graph-card wide"),
+        html.Div([dcc.Graph(figure=graph_temporal(t, P, D, period, peaks, bands))], className="graph-card wide"),
         # Pasamos parámetros extra a graph_phase para calcular el equilibrio
         html.Div([dcc.Graph(figure=graph_phase(P, D, a, b, d, g))], className="graph-card"),
-        # OPTIMIZACIÓN: Pasamos 'sol' para evitar recalcular la simulación principal
-        html.Div([dcc.Graph(figure=graph_orbits(a, b, d, g, P0, D0, tmax, main_solution=sol))], className="graph-card"),
+        # OPTIMIZACIÓN: las órbitas salen de las curvas de nivel de H (sin simular)
+        html.Div([dcc.Graph(figure=graph_orbits(a, b, d, g, P0, D0, tmax))], className="graph-card"),
+        # Sensibilidades integradas junto al estado (una pasada RK4, sin diferencias finitas)
+        html.Div([dcc.Graph(figure=graph_sensitivity(sensitivity_ranking(a, b, d, g, P0, D0, tmax)))], className="graph-card wide"),
     ]
 
+@callback(
+    Output("spatial-sim", "data"), Output("spatial-frame", "value"),
+    Input("spatial-button", "n_clicks"),
+    State("alpha", "value"), State("beta", "value"), State("delta", "value"), State("gamma", "value"),
+    State("P0", "value"), State("D0", "value"), State("tmax", "value"),
+    prevent_initial_call=True
+)
+def run_spatial_sim(click, a, b, d, g, P0, D0, tmax):
+    is_valid, _ = validate_inputs(a, b, d, g, P0, D0, tmax)
+    if not is_valid:
+        return None, 0
+
+    # Se lanza en segundo plano: los fotogramas se vuelcan a disco según se
+    # calculan y aquí solo viaja el identificador
+    sim_id = run_spatial(float(a), float(b), float(d), float(g), float(P0), float(D0), float(tmax),
+                         n=SPATIAL_UI_GRID, background=True)
+    return sim_id, 0
+
+@callback(
+    Output("spatial-frame", "max"), Output("spatial-frame", "marks"), Output("spatial-poll", "disabled"),
+    Input("spatial-poll", "n_intervals"), Input("spatial-sim", "data"),
+    prevent_initial_call=True
+)
+def poll_spatial(_, sim_id):
+    """Amplía el slider con los fotogramas ya escritos; deja de consultar al terminar."""
+    if not sim_id:
+        return 0, {}, True
+    try:
+        meta = spatial_meta(sim_id)
+    except (OSError, ValueError):
+        return 0, {}, False     # El hilo aún no escribió los metadatos
+
+    times = meta["t"]
+    last = max(len(times) - 1, 0)
+    marks = {k: f"{times[k]:g}" for k in range(0, len(times), max(1, last // 5))}
+    return last, marks, meta["complete"] or "error" in meta
+
+@callback(
+    Output("spatial-graph", "figure"),
+    Input("spatial-frame", "value"), Input("spatial-species", "value"),
+    Input("spatial-sim", "data"), Input("spatial-frame", "max"),
+)
+def show_spatial_frame(k, species, sim_id, last):
+    if not sim_id:
+        return graph_spatial()
+    # Lectura perezosa: solo el fotograma pedido sale del memmap
+    try:
+        t, P, D = load_spatial_frame(sim_id, min(int(k or 0), int(last or 0)), max_size=SPATIAL_UI_CELLS)
+    except (OSError, ValueError, IndexError):
+        return graph_spatial(species=species, pending=True)     # Aún sin fotogramas
+    return graph_spatial(t, P if species == "P" else D, species)
+
 @callback(
     Output("video-status", "children"), Output("video-download", "children"),
     Input("video-button", "n_clicks"),
@@ -20,6 +20,29 @@ def test_import(module_name, display_name=None):
         print(f"❌ {display_name:20s} - FAILED: {e}")
         return False
 
+def test_simulation_backends():
+    """Verifica que el kernel Numba y el bucle Python den las mismas trayectorias"""
+    try:
+        import numpy as np
+        from backend.simulation import NUMBA_AVAILABLE, simulate_lotka_volterra
+    except ImportError as e:
+        print(f"❌ {'Backends RK4':20s} - FAILED: {e}")
+        return False
+
+    if not NUMBA_AVAILABLE:
+        print(f"⚠️  {'Backends RK4':20s} - Numba no instalado (se usa Python puro)")
+        return True
+
+    ref = simulate_lotka_volterra(t_max=300, backend="python")
+    jit = simulate_lotka_volterra(t_max=300, backend="numba")
+    same = np.allclose(ref["P"], jit["P"], rtol=1e-12, atol=0) and \
+        np.allclose(ref["D"], jit["D"], rtol=1e-12, atol=0)
+    if same:
+        print(f"✅ {'Backends RK4':20s} - Numba y Python coinciden")
+    else:
+        print(f"❌ {'Backends RK4':20s} - FAILED: las trayectorias difieren")
+    return same
+
 def main():
     """Run all dependency tests"""
     print("=" * 70)
@@ -35,6 +58,8 @@ def main():
     all_ok &= test_import('numpy', 'NumPy')
     all_ok &= test_import('scipy', 'SciPy')
     all_ok &= test_import('sympy', 'SymPy')
+    test_import('numba', 'Numba (opcional)')
+    all_ok &= test_simulation_backends()
     
     # Web framework
     print("\n🌐 WEB FRAMEWORK:")